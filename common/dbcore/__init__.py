@@ -0,0 +1,8 @@
+"""
+Общий слой доступа к PostgreSQL для приложений task_1, task_3, task_4 и task_7.
+
+connector - DatabaseConnection: один пул для сессий SQLAlchemy и «сырых» asyncpg-соединений.
+config - DatabaseConfig, instrumentation - метрики запросов и пула, cache - TTLCache,
+bulk - COPY, upsert и пакетный UPDATE, base_repository - BaseRepository, setup_logger - трассировка методов,
+bench - нагрузочный тест пула (время старта, пропускная способность, задержки).
+"""
@@ -0,0 +1,107 @@
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set
+
+from dbcore.cache import TTLCache
+from dbcore.connector import DatabaseConnection
+from dbcore.setup_logger import decorate_all_methods
+
+
+@dataclass
+class _PendingCacheChanges:
+    """Изменения кеша, отложенные до коммита единицы работы"""
+    cache: TTLCache
+    forget: Set[Hashable] = field(default_factory=set)
+    remember: Dict[Hashable, Any] = field(default_factory=dict)
+    clear: bool = False
+
+    def touches(self, key: Hashable) -> bool:
+        return self.clear or key in self.forget or key in self.remember
+
+    def apply(self) -> None:
+        if self.clear:
+            self.cache.clear()
+        self.cache.invalidate(*self.forget)
+        for key, value in self.remember.items():
+            self.cache.set(key, value)
+
+
+@decorate_all_methods
+class BaseRepository:
+    """
+    Базовый репозиторий: подключение к БД и необязательный read-through кеш.
+
+    Внутри db.transaction() изменения кеша (_forget, _forget_all, _remember) копятся
+    и применяются только после коммита; при откате кеш не трогается.
+    """
+
+    def __init__(self, db: DatabaseConnection, cache: Optional[TTLCache] = None):
+        """
+        Инициализация репозитория.
+
+        Args:
+            db (DatabaseConnection): Подключение, предоставляет session(), transaction() и connection().
+            cache (Optional[TTLCache]): read-through кеш; None - без кеша.
+        """
+        self.db = db
+        self.cache = cache
+
+    async def _cached(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Значение из кеша по key или результат loader().
+
+        Внутри db.transaction() мимо кеша читаются только ключи, изменённые этой единицей работы:
+        она видит свои незафиксированные изменения, и они не должны попасть в общий кеш.
+        """
+        if self.cache is None:
+            return await loader()
+        pending = self._pending_changes()
+        if pending is not None and pending.touches(key):
+            return await loader()
+        return await self.cache.get_or_load(key, loader)
+
+    def _forget(self, *keys: Hashable) -> None:
+        """Сбрасывает ключи кеша, если он есть; внутри единицы работы - после её коммита."""
+        if self.cache is None:
+            return
+        pending = self._pending_changes()
+        if pending is None:
+            self.cache.invalidate(*keys)
+            return
+        pending.forget.update(keys)
+        for key in keys:
+            pending.remember.pop(key, None)
+
+    def _forget_all(self) -> None:
+        """Очищает кеш, если он есть; внутри единицы работы - после её коммита."""
+        if self.cache is None:
+            return
+        pending = self._pending_changes()
+        if pending is None:
+            self.cache.clear()
+            return
+        pending.clear = True
+        pending.remember.clear()
+
+    def _remember(self, key: Hashable, value: Any) -> None:
+        """Кладёт свежее значение в кеш, если он есть; внутри единицы работы - после её коммита."""
+        if self.cache is None:
+            return
+        pending = self._pending_changes()
+        if pending is None:
+            self.cache.set(key, value)
+        else:
+            pending.remember[key] = value
+
+    def _pending_changes(self) -> Optional[_PendingCacheChanges]:
+        """Отложенные изменения кеша текущей единицы работы; None вне db.transaction()."""
+        info = self.db.transaction_info
+        if info is None:
+            return None
+        changes = info.get(("cache", id(self.cache)))
+        if changes is None:
+            changes = info[("cache", id(self.cache))] = _PendingCacheChanges(self.cache)
+            self.db.after_commit(changes.apply)
+        return changes
+
+    def __repr__(self):
+        return f"<{type(self).__name__}(db={self.db!r}, cache={self.cache!r})>"
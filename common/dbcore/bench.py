@@ -0,0 +1,79 @@
+import asyncio
+import random
+import statistics
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Awaitable, Callable, Sequence
+
+from dbcore.config import DatabaseConfig
+from dbcore.connector import DatabaseConnection
+from dbcore.instrumentation import QueryMetrics
+
+POOL_SIZES = (1, 2, 4, 8, 16, 32)
+
+# Фабрика запроса нагрузки: по подключению возвращает корутинную функцию одного запроса
+RequestFactory = Callable[[DatabaseConnection], Callable[[random.Random], Awaitable[Any]]]
+
+
+@dataclass(frozen=True)
+class PoolRunDTO:
+    """Результат прогона нагрузки на одном размере пула"""
+    pool_size: int
+    startup_ms: float
+    throughput: float
+    p50_ms: float
+    p99_ms: float
+    saturated: float
+
+    def __str__(self):
+        return (f"{self.pool_size:>4} | {self.startup_ms:>9.1f} | {self.throughput:>10.0f} | "
+                f"{self.p50_ms:>8.2f} | {self.p99_ms:>8.2f} | {self.saturated:>9.0%}")
+
+
+async def _worker(request: Callable[[random.Random], Awaitable[Any]], deadline: float, latencies: list) -> None:
+    rnd = random.Random()
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await request(rnd)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def measure_pool(config: DatabaseConfig, pool_size: int, make_request: RequestFactory,
+                       concurrency: int, duration: float, **connection_kwargs) -> PoolRunDTO:
+    """
+    Запускает concurrency клиентов на duration секунд против пула размера pool_size.
+
+    Замеряется время connect() (создание пула и прогрев min_size соединений),
+    пропускная способность, p50/p99 задержки запроса и доля ожиданий свободного соединения.
+    """
+    db = DatabaseConnection(replace(config, min_size=pool_size, max_size=pool_size),
+                            QueryMetrics(slow_query_ms=float("inf")), **connection_kwargs)
+    started = time.perf_counter()
+    await db.connect()
+    startup_ms = (time.perf_counter() - started) * 1000
+    try:
+        request = make_request(db)
+        latencies = []
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(_worker(request, deadline, latencies) for _ in range(concurrency)))
+        pool = db.metrics.snapshot().pool
+        saturated = pool.saturated / max(pool.acquires, 1)
+        if len(latencies) < 2:
+            # quantiles требует минимум двух точек; при единственном запросе он же и p50, и p99
+            p50 = p99 = latencies[0] if latencies else float("nan")
+        else:
+            percentiles = statistics.quantiles(latencies, n=100)
+            p50, p99 = percentiles[49], percentiles[98]
+        return PoolRunDTO(pool_size, startup_ms, len(latencies) / duration, p50, p99, saturated)
+    finally:
+        await db.close()
+
+
+async def benchmark_pools(config: DatabaseConfig, make_request: RequestFactory, concurrency: int,
+                          duration: float, pool_sizes: Sequence[int] = POOL_SIZES, **connection_kwargs) -> None:
+    """Печатает таблицу: время старта, запросов/с, p50/p99 и насыщение пула для каждого размера пула"""
+    print(f"Конкурентных клиентов: {concurrency}, {duration:.0f} с на каждый размер пула\n")
+    print(f"{'пул':>4} | {'старт, мс':>9} | {'запросов/с':>10} | {'p50, мс':>8} | {'p99, мс':>8} | "
+          f"{'ждали пул':>9}")
+    for pool_size in pool_sizes:
+        print(str(await measure_pool(config, pool_size, make_request, concurrency, duration, **connection_kwargs)))
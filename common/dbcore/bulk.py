@@ -0,0 +1,114 @@
+from functools import lru_cache
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, List, Sequence, Tuple, Union
+
+from sqlalchemy import TextClause, text
+
+# Колонка для массовых операций: (имя колонки, SQL-тип элемента массива)
+Column = Tuple[str, str]
+
+
+async def chunked(source: Union[Iterable[Any], AsyncIterable[Any]], size: int) -> AsyncIterator[List[Any]]:
+    """Разбивает синхронный или асинхронный поток на списки по size элементов."""
+    chunk: List[Any] = []
+    if isinstance(source, AsyncIterable):
+        async for item in source:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    else:
+        for item in source:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def _unnest(columns: Sequence[Column]) -> str:
+    """unnest(CAST(:name AS type[]), ...): по одному параметру-массиву на колонку."""
+    return "unnest(" + ", ".join(f"CAST(:{name} AS {sql_type}[])" for name, sql_type in columns) + ")"
+
+
+@lru_cache(maxsize=None)
+def bulk_update_statement(table: str, key: Column, columns: Tuple[Column, ...],
+                          returning: Tuple[str, ...] = ()) -> TextClause:
+    """
+    UPDATE ... FROM unnest: обновляет columns у строк, найденных по key, одним запросом.
+
+    Параметры запроса - массивы с именами колонок (key и columns), поэтому текст не зависит
+    от размера пачки и готовится один раз.
+
+    Args:
+        table (str): Имя таблицы.
+        key (Column): Колонка, по которой ищутся строки.
+        columns (Tuple[Column, ...]): Обновляемые колонки.
+        returning (Tuple[str, ...], optional): Колонки таблицы для RETURNING.
+
+    Returns:
+        TextClause: Запрос с параметрами :<key>, :<column>...
+    """
+    names = [key[0]] + [name for name, _ in columns]
+    sql = (f"UPDATE {table} AS t SET " + ", ".join(f"{name} = v.{name}" for name, _ in columns)
+           + f" FROM {_unnest((key,) + columns)} AS v({', '.join(names)})"
+           + f" WHERE t.{key[0]} = v.{key[0]}")
+    if returning:
+        sql += " RETURNING " + ", ".join(f"t.{name}" for name in returning)
+    return text(sql)
+
+
+@lru_cache(maxsize=None)
+def upsert_statement(table: str, columns: Tuple[Column, ...], conflict: Tuple[str, ...],
+                     count_inserted: bool = False) -> TextClause:
+    """
+    INSERT ... SELECT FROM unnest ... ON CONFLICT DO UPDATE для пачки строк, переданной колонками.
+
+    Все колонки, кроме conflict, при конфликте перезаписываются новыми значениями.
+    Повторяющиеся в одной пачке ключи PostgreSQL не принимает - их нужно схлопнуть заранее.
+
+    Args:
+        table (str): Имя таблицы.
+        columns (Tuple[Column, ...]): Вставляемые колонки, они же имена параметров-массивов.
+        conflict (Tuple[str, ...]): Колонки уникального ключа.
+        count_inserted (bool, optional): Вернуть одну строку (inserted, updated) с числом
+            вставленных и обновлённых строк.
+
+    Returns:
+        TextClause: Запрос с параметрами :<column>...
+    """
+    names = [name for name, _ in columns]
+    updates = ", ".join(f"{name} = EXCLUDED.{name}" for name in names if name not in conflict)
+    sql = (f"INSERT INTO {table} ({', '.join(names)}) SELECT * FROM {_unnest(columns)}"
+           f" ON CONFLICT ({', '.join(conflict)}) DO UPDATE SET {updates}")
+    if count_inserted:
+        sql = (f"WITH upserted AS ({sql} RETURNING (xmax = 0) AS inserted)"
+               " SELECT count(*) FILTER (WHERE inserted) AS inserted,"
+               " count(*) FILTER (WHERE NOT inserted) AS updated FROM upserted")
+    return text(sql)
+
+
+async def copy_records(db, table: str, columns: Sequence[str],
+                       records: Union[Iterable[tuple], AsyncIterable[tuple]], chunk_size: int = 100_000) -> int:
+    """
+    Загружает кортежи в таблицу бинарным COPY через asyncpg-соединение пула одной транзакцией.
+
+    Поток читается пачками по chunk_size и целиком в память не попадает.
+
+    Args:
+        db (DatabaseConnection): Подключение, из пула которого берётся asyncpg-соединение.
+        table (str): Имя таблицы.
+        columns (Sequence[str]): Колонки в порядке значений кортежа.
+        records (Iterable[tuple] | AsyncIterable[tuple]): Поток строк.
+        chunk_size (int, optional): Размер пачки.
+
+    Returns:
+        int: Количество загруженных строк.
+    """
+    copied = 0
+    async with db.connection() as conn:
+        async with conn.transaction():
+            async for chunk in chunked(records, chunk_size):
+                await conn.copy_records_to_table(table, records=chunk, columns=list(columns))
+                copied += len(chunk)
+    return copied
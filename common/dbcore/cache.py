@@ -0,0 +1,160 @@
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+@dataclass(frozen=True)
+class CacheStatsDTO:
+    """Счётчики кеша"""
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __str__(self):
+        return (f"Кеш: попаданий {self.hits}, промахов {self.misses} ({self.hit_ratio:.0%}), "
+                f"вытеснено {self.evictions}, записей {self.entries}, ~{self.size_bytes} байт")
+
+
+def approx_size(value: Any) -> int:
+    """Приблизительный размер значения в байтах: сам объект и его элементы или атрибуты на уровень вглубь."""
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(approx_size(item) for item in value)
+    elif hasattr(value, "__dict__"):
+        size += sum(sys.getsizeof(attr) for attr in vars(value).values())
+    return size
+
+
+class TTLCache:
+    """
+    In-process LRU-кеш с временем жизни записей и ограничением по числу записей и объёму.
+
+    Значения None не кешируются, чтобы вставка новой записи не маскировалась
+    закешированным промахом. Для ключей, которые сейчас загружает get_or_load, хранится
+    поколение: invalidate и clear его сдвигают, и устаревший результат загрузки не кешируется.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl: float = 60.0, max_bytes: int = 64 * 1024 * 1024,
+                 sizeof: Callable[[Any], int] = approx_size):
+        """
+        Инициализация кеша.
+
+        Args:
+            max_entries: максимальное количество записей.
+            ttl: время жизни записи в секундах.
+            max_bytes: ограничение приблизительного объёма всех записей в байтах.
+            sizeof: функция оценки размера значения.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self._size_bytes = 0
+        # ключ -> (загрузок в процессе, поколение); только для ключей, которые сейчас загружаются
+        self._loading: Dict[Hashable, Tuple[int, int]] = {}
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Получить значение из кеша.
+
+        Returns:
+            Пара (найдено, значение). Просроченная запись считается промахом и удаляется.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[1] < time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[0]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Положить значение в кеш, вытеснив самые старые записи при превышении лимитов."""
+        if value is None:
+            return
+        if key in self._entries:
+            self._remove(key)
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (value, time.monotonic() + self.ttl, size)
+        self._size_bytes += size
+        while len(self._entries) > self.max_entries or self._size_bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Read-through: вернуть значение из кеша или загрузить его через loader и закешировать.
+
+        Если ключ инвалидирован, пока loader выполнялся, значение возвращается, но не кешируется:
+        оно могло быть прочитано до изменения, из-за которого пришла инвалидация.
+
+        Args:
+            key: ключ кеша.
+            loader: корутинная функция без аргументов, загружающая значение из БД.
+        """
+        found, value = self.get(key)
+        if found:
+            return value
+        started = self._start_load(key)
+        try:
+            value = await loader()
+        finally:
+            fresh = self._finish_load(key, started)
+        if fresh:
+            self.set(key, value)
+        return value
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Удалить записи по ключам (отсутствующие ключи игнорируются) и сдвинуть поколение загружаемых."""
+        for key in keys:
+            if key in self._loading:
+                loads, generation = self._loading[key]
+                self._loading[key] = (loads, generation + 1)
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Очистить кеш, сохранив счётчики; результаты начатых загрузок не будут закешированы."""
+        self._entries.clear()
+        self._size_bytes = 0
+        self._epoch += 1
+
+    def stats(self) -> CacheStatsDTO:
+        """Текущие счётчики кеша."""
+        return CacheStatsDTO(self.hits, self.misses, self.evictions, len(self._entries), self._size_bytes)
+
+    def _start_load(self, key: Hashable) -> Tuple[int, int]:
+        loads, generation = self._loading.get(key, (0, 0))
+        self._loading[key] = (loads + 1, generation)
+        return self._epoch, generation
+
+    def _finish_load(self, key: Hashable, started: Tuple[int, int]) -> bool:
+        loads, generation = self._loading.pop(key)
+        if loads > 1:
+            self._loading[key] = (loads - 1, generation)
+        return started == (self._epoch, generation)
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self._size_bytes -= size
+
+    def __repr__(self):
+        return f"<TTLCache(max_entries={self.max_entries}, ttl={self.ttl}, max_bytes={self.max_bytes})>"
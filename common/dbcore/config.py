@@ -0,0 +1,85 @@
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
+@dataclass(frozen=True)
+class DatabaseConfig:
+    """
+    Параметры подключения и пула.
+
+    min_size / max_size - постоянная часть пула (pool_size) и предел вместе с overflow;
+    min_size соединений открываются при connect().
+    max_queries - после стольких запросов соединение пересоздаётся (0 - без ограничения).
+    connection_lifetime - предельный возраст соединения в секундах: более старое пересоздаётся при выдаче
+    из пула (pool_recycle SQLAlchemy). Это не таймаут простоя, как max_inactive_connection_lifetime
+    в asyncpg.create_pool: активно используемое соединение тоже пересоздаётся.
+    statement_cache_size - размер кеша prepared statements на соединение (0 - отключить, например за pgbouncer).
+    pre_ping - проверять соединение перед выдачей из пула.
+    server_settings - параметры сессии PostgreSQL, например {"search_path": "app", "application_name": "shop"}.
+    metrics - собирать метрики запросов и пула (DatabaseConnection создаёт QueryMetrics).
+    slow_query_ms - при включённых metrics запросы дольше порога пишутся в лог с уровнем WARNING.
+    """
+    host: str
+    port: int
+    user: str
+    password: str
+    database: str
+
+    # Настройки пула соединений
+    min_size: int = 10
+    max_size: int = 10
+    max_queries: int = 50_000
+    connection_lifetime: float = 300.0
+    statement_cache_size: int = 100
+    pre_ping: bool = False
+    server_settings: Optional[Dict[str, str]] = None
+
+    # Метрики запросов и пула
+    metrics: bool = False
+    slow_query_ms: float = 500.0
+
+    def __post_init__(self):
+        if self.max_size < 1:
+            raise ValueError(f"max_size должен быть не меньше 1, получено {self.max_size}")
+        if not 0 <= self.min_size <= self.max_size:
+            # Иначе max_overflow = max_size - min_size отрицателен, и QueuePool перестаёт ограничивать пул
+            raise ValueError(f"min_size должен быть в пределах [0; max_size={self.max_size}], получено {self.min_size}")
+        if self.max_queries < 0:
+            raise ValueError(f"max_queries не может быть отрицательным, получено {self.max_queries}")
+        if self.connection_lifetime <= 0:
+            raise ValueError(f"connection_lifetime должен быть положительным, получено {self.connection_lifetime}")
+
+    @classmethod
+    def from_env(cls, **overrides) -> "DatabaseConfig":
+        """
+        Конфигурация из переменных окружения DB_HOST, DB_PORT, DB_USER, DB_PASSWORD, DB_NAME и DB_METRICS.
+
+        Без переменных используются localhost:5432, пользователь postgres, база employees, пустой пароль
+        и выключенные метрики. overrides задают остальные поля (например min_size, max_size).
+        """
+        settings = dict(
+            host=os.environ.get("DB_HOST", "localhost"),
+            port=int(os.environ.get("DB_PORT", "5432")),
+            user=os.environ.get("DB_USER", "postgres"),
+            password=os.environ.get("DB_PASSWORD", ""),
+            database=os.environ.get("DB_NAME", "employees"),
+            metrics=metrics_enabled(),
+        )
+        settings.update(overrides)
+        return cls(**settings)
+
+    @property
+    def dsn(self) -> str:
+        """DSN для asyncpg"""
+        return f"postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
+
+    @property
+    def url(self) -> str:
+        """URL для SQLAlchemy с драйвером asyncpg"""
+        return f"postgresql+asyncpg://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
+
+
+def metrics_enabled() -> bool:
+    """Включены ли метрики переменной окружения DB_METRICS (1, true, yes, on)."""
+    return os.environ.get("DB_METRICS", "").strip().lower() in ("1", "true", "yes", "on")
@@ -0,0 +1,269 @@
+import time
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Optional, AsyncIterator, Sequence
+from contextlib import AsyncExitStack, asynccontextmanager
+import asyncpg
+from sqlalchemy import Connection, MetaData, event, exc, text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from dbcore.config import DatabaseConfig
+from dbcore.instrumentation import InstrumentedConnection, QueryMetrics
+from dbcore.setup_logger import decorate_all_methods
+
+
+@decorate_all_methods
+class DatabaseConnection:
+    """
+    Подключение к PostgreSQL: один пул соединений для сессий SQLAlchemy (session(), transaction())
+    и «сырых» asyncpg-соединений (connection()).
+    """
+
+    def __init__(self, config: DatabaseConfig, metrics: Optional[QueryMetrics] = None,
+                 init: Optional[Callable[[asyncpg.Connection], Awaitable[None]]] = None,
+                 metadata: Optional[MetaData] = None, extensions: Sequence[str] = ()):
+        """
+        Инициализация подключения.
+
+        Args:
+            config (DatabaseConfig): Конфигурация подключения и пула.
+            metrics (Optional[QueryMetrics]): Сборщик метрик запросов и пула. None - создаётся при
+                config.metrics, иначе замеры не ведутся.
+            init (Optional[Callable]): Корутина, вызываемая с asyncpg-соединением для каждого нового
+                соединения пула (кодеки типов, SET и т.п.).
+            metadata (Optional[MetaData]): Метаданные ORM-моделей приложения; при connect() создаются
+                недостающие таблицы и индексы. None - схемой управляет само приложение.
+            extensions (Sequence[str]): Расширения PostgreSQL, создаваемые при connect() (например pg_trgm).
+        """
+        self._config = config
+        # Предел пула храним сами: QueuePool не отдаёт max_overflow публично
+        self._max_size = config.max_size
+        if metrics is None and config.metrics:
+            metrics = QueryMetrics(slow_query_ms=config.slow_query_ms)
+        self._engine = create_async_engine(
+            self._config.url,
+            echo=False,
+            pool_size=self._config.min_size,
+            max_overflow=self._config.max_size - self._config.min_size,
+            pool_recycle=self._config.connection_lifetime,
+            pool_pre_ping=self._config.pre_ping,
+            connect_args={
+                # Кеш prepared statements SQLAlchemy и самого asyncpg (для connection())
+                "prepared_statement_cache_size": self._config.statement_cache_size,
+                "statement_cache_size": self._config.statement_cache_size,
+                "server_settings": self._config.server_settings or {},
+            },
+        )
+        self._async_session_maker: Optional[sessionmaker] = None
+        # Сессия открытой единицы работы (transaction()) в текущей задаче
+        self._unit_of_work: ContextVar[Optional[AsyncSession]] = ContextVar(f"unit_of_work_{id(self)}", default=None)
+        self._metadata = metadata
+        self._extensions = tuple(extensions)
+        self.metrics = metrics
+        if init is not None:
+            _register_init(self._engine, init)
+        if self._config.max_queries:
+            _limit_queries(self._engine, self._config.max_queries)
+        if metrics is not None:
+            _instrument_engine(self._engine, metrics)
+
+    async def connect(self) -> None:
+        """
+        Инициализация session maker и пула.
+
+        Создаёт расширения extensions, таблицы и недостающие индексы из metadata
+        (в том числе для таблиц, созданных до появления индекса) и открывает min_size соединений пула.
+        """
+        self._async_session_maker = sessionmaker(
+            self._engine, class_=AsyncSession, expire_on_commit=False
+        )
+        if self._metadata is not None or self._extensions:
+            async with self._engine.begin() as conn:
+                for extension in self._extensions:
+                    await conn.execute(text(f"CREATE EXTENSION IF NOT EXISTS {extension}"))
+                if self._metadata is not None:
+                    await conn.run_sync(self._metadata.create_all)
+                    await conn.run_sync(_create_missing_indexes, self._metadata)
+        await self._warm_up()
+
+    async def _warm_up(self) -> None:
+        """Открывает min_size соединений заранее, чтобы первые запросы не ждали подключения."""
+        async with AsyncExitStack() as stack:
+            for _ in range(self._config.min_size):
+                await stack.enter_async_context(self._engine.connect())
+
+    async def close(self) -> None:
+        """Закрываем engine"""
+        await self._engine.dispose()
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        """
+        Контекстный менеджер для получения сессии.
+
+        Вне transaction() открывает отдельную сессию и коммитит её на выходе (rollback при ошибке).
+        Внутри transaction() отдаёт сессию единицы работы, фиксацией управляет transaction().
+        """
+        current = self._unit_of_work.get()
+        if current is not None:
+            yield current
+            return
+        if not self._async_session_maker:
+            raise RuntimeError("Session maker не инициализирован. Вызовите connect() сначала.")
+
+        async_session = self._async_session_maker()
+        try:
+            if self.metrics is not None:
+                # Соединение берётся сразу, чтобы замерить ожидание пула
+                saturated, started = _pool_saturated(self._engine, self._max_size), time.perf_counter()
+                await async_session.connection()
+                _record_acquire(self._engine, self._max_size, self.metrics, saturated, started)
+            yield async_session
+            await async_session.commit()
+        except Exception as e:
+            await async_session.rollback()
+            raise
+        finally:
+            await async_session.close()
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[AsyncSession]:
+        """
+        Единица работы: все вызовы репозиториев внутри блока идут через одну сессию и одну транзакцию.
+
+        Коммит выполняется один раз на выходе из блока, при исключении всё откатывается.
+        После коммита вызываются колбэки after_commit() (например, инвалидация кеша).
+        Вложенный transaction() присоединяется к внешнему. connection() в единицу работы не входит.
+        Сессия не рассчитана на конкурентное использование: не запускайте внутри блока параллельные задачи с БД.
+
+        Пример:
+            async with db.transaction() as uow:
+                await repo.update_price_by_name("Apple", Decimal("19.99"))
+                product = await repo.get_product_by_name("Apple")
+        """
+        current = self._unit_of_work.get()
+        if current is not None:
+            yield current
+            return
+        async with self.session() as session:
+            token = self._unit_of_work.set(session)
+            try:
+                yield session
+            finally:
+                self._unit_of_work.reset(token)
+        for callback in session.info.pop("after_commit", ()):
+            callback()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """
+        Вызвать callback после коммита текущей единицы работы.
+
+        Вне transaction() callback вызывается сразу; при откате единицы работы не вызывается.
+        """
+        current = self._unit_of_work.get()
+        if current is None:
+            callback()
+        else:
+            current.info.setdefault("after_commit", []).append(callback)
+
+    @property
+    def in_transaction(self) -> bool:
+        """Открыта ли единица работы transaction() в текущей задаче."""
+        return self._unit_of_work.get() is not None
+
+    @property
+    def transaction_info(self) -> Optional[dict]:
+        """Словарь для состояния, живущего до конца текущей единицы работы; None вне transaction()."""
+        current = self._unit_of_work.get()
+        return None if current is None else current.info
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[asyncpg.Connection]:
+        """
+        Контекстный менеджер для получения «сырого» asyncpg-соединения из того же пула, что и session().
+
+        Нужен для API asyncpg, которого нет в SQLAlchemy: COPY, курсоры, executemany с $1-параметрами.
+        Транзакцией управляет вызывающий код (conn.transaction()), в единицу работы transaction()
+        соединение не входит. Соединение возвращается в пул при выходе из контекста,
+        для max_queries одно получение считается одним запросом.
+        При заданных metrics запросы идут через InstrumentedConnection.
+        """
+        saturated = self.metrics is not None and _pool_saturated(self._engine, self._max_size)
+        started = time.perf_counter()
+        async with self._engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            raw.info["queries"] = raw.info.get("queries", 0) + 1
+            if self.metrics is None:
+                yield raw.driver_connection
+            else:
+                _record_acquire(self._engine, self._max_size, self.metrics, saturated, started)
+                yield InstrumentedConnection(raw.driver_connection, self.metrics)
+
+    def __repr__(self):
+        return f"<DatabaseConnection(id={id(self)})>"
+
+
+def _pool_saturated(engine: AsyncEngine, max_size: int) -> bool:
+    """Все max_size соединений QueuePool engine выданы, следующему придётся ждать."""
+    return engine.pool.checkedout() >= max_size
+
+
+def _record_acquire(engine: AsyncEngine, max_size: int, metrics: QueryMetrics, saturated: bool,
+                    started: float) -> None:
+    """Учитывает в metrics ожидание соединения, начатое в started, и текущую загрузку пула."""
+    pool = engine.pool
+    # overflow() начинается с -size(), поэтому их сумма - число открытых соединений
+    metrics.record_acquire((time.perf_counter() - started) * 1000, saturated, pool.checkedout(),
+                           pool.size() + pool.overflow(), max_size)
+
+
+def _register_init(engine: AsyncEngine, init: Callable[[asyncpg.Connection], Awaitable[None]]) -> None:
+    """Вызывает init для каждого нового соединения пула engine."""
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        dbapi_connection.run_async(init)
+
+
+def _limit_queries(engine: AsyncEngine, max_queries: int) -> None:
+    """Пересоздаёт соединение пула engine после max_queries запросов, как max_queries пула asyncpg."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        conn.info["queries"] = conn.info.get("queries", 0) + 1
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        if connection_record.info.get("queries", 0) >= max_queries:
+            # Пул закрывает такое соединение и выдаёт вместо него новое
+            raise exc.DisconnectionError(f"Соединение выполнило {max_queries} запросов")
+
+
+def _instrument_engine(engine: AsyncEngine, metrics: QueryMetrics) -> None:
+    """Подписывает metrics на события выполнения запросов engine."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_started"].pop()) * 1000
+        # Адаптер asyncpg берёт rowcount из статуса команды (в том числе SELECT n);
+        # -1 у серверных курсоров и executemany
+        rows = cursor.rowcount
+        if rows < 0:
+            rows = len(parameters) if executemany else None
+        metrics.record_query(statement, elapsed_ms, rows)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def handle_error(context):
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            metrics.record_query(context.statement or "", (time.perf_counter() - started.pop()) * 1000, failed=True)
+
+
+def _create_missing_indexes(connection: Connection, metadata: MetaData) -> None:
+    """Создаёт объявленные в metadata индексы, которых ещё нет в БД."""
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
@@ -0,0 +1,268 @@
+import json
+import logging
+import re
+import time
+from bisect import bisect_left
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Границы корзин гистограмм задержек, мс; последняя корзина - всё, что дольше
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+OTHER_STATEMENTS = "<other>"
+
+log = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def normalize_sql(sql: str) -> str:
+    """SQL без литералов и лишних пробелов - ключ, по которому группируется статистика запросов"""
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+@dataclass(frozen=True)
+class StatementStatsDTO:
+    """Статистика одного нормализованного запроса"""
+    sql: str
+    calls: int
+    errors: int
+    rows: int
+    total_ms: float
+    max_ms: float
+    buckets: Tuple[int, ...]
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+    def __str__(self):
+        return (f"{self.calls} вызовов, среднее {self.avg_ms:.2f} мс, максимум {self.max_ms:.2f} мс, "
+                f"строк {self.rows}, ошибок {self.errors}: {self.sql}")
+
+
+@dataclass(frozen=True)
+class PoolStatsDTO:
+    """Ожидание соединений из пула и его загрузка"""
+    acquires: int
+    saturated: int
+    total_wait_ms: float
+    max_wait_ms: float
+    buckets: Tuple[int, ...]
+    in_use: int
+    size: int
+    max_size: int
+
+    def __str__(self):
+        return (f"Пул: выдано соединений {self.acquires}, из них при полном пуле {self.saturated}, "
+                f"ожидание max {self.max_wait_ms:.2f} мс, занято {self.in_use}/{self.max_size}")
+
+
+@dataclass(frozen=True)
+class MetricsSnapshotDTO:
+    statements: List[StatementStatsDTO]
+    pool: PoolStatsDTO
+
+    def __str__(self):
+        """Пул и десять самых дорогих запросов, по строке на каждый"""
+        return "\n".join([str(self.pool)] + [str(item) for item in self.statements[:10]])
+
+
+class _Histogram:
+    """Счётчик, сумма, максимум и корзины задержек"""
+
+    __slots__ = ("count", "total_ms", "max_ms", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+
+
+class _StatementStats(_Histogram):
+    __slots__ = ("errors", "rows")
+
+    def __init__(self):
+        super().__init__()
+        self.errors = 0
+        self.rows = 0
+
+
+class QueryMetrics:
+    """
+    Сборщик метрик запросов и пула соединений.
+
+    Передаётся в DatabaseConnection; для своей обработки (отправки в другую систему и т.п.)
+    достаточно переопределить record_query и record_acquire.
+    """
+
+    def __init__(self, slow_query_ms: float = 500.0, max_statements: int = 1000):
+        """
+        slow_query_ms - запросы дольше этого порога пишутся в лог с уровнем WARNING.
+        max_statements - предел числа различных запросов, остальные учитываются под ключом <other>.
+        """
+        self.slow_query_ms = slow_query_ms
+        self.max_statements = max_statements
+        self.reset()
+
+    def reset(self) -> None:
+        """Обнуляет накопленные метрики"""
+        self._statements: Dict[str, _StatementStats] = {}
+        self._acquire = _Histogram()
+        self._saturated = 0
+        self._pool_state = (0, 0, 0)
+
+    def record_query(self, sql: str, elapsed_ms: float, rows: Optional[int] = None, failed: bool = False) -> None:
+        """Учитывает выполненный запрос"""
+        key = normalize_sql(sql)
+        stats = self._statements.get(key)
+        if stats is None:
+            if len(self._statements) >= self.max_statements:
+                key = OTHER_STATEMENTS
+            stats = self._statements.setdefault(key, _StatementStats())
+        stats.record(elapsed_ms)
+        stats.errors += failed
+        stats.rows += rows or 0
+        if elapsed_ms >= self.slow_query_ms:
+            log.warning(f"Медленный запрос: {elapsed_ms:.1f} мс, строк {rows}, ошибка {failed}: {key}")
+
+    def record_acquire(self, wait_ms: float, saturated: bool, in_use: int, size: int, max_size: int) -> None:
+        """Учитывает получение соединения из пула; saturated - в момент запроса свободных соединений не было"""
+        self._acquire.record(wait_ms)
+        self._saturated += saturated
+        self._pool_state = (in_use, size, max_size)
+
+    def snapshot(self) -> MetricsSnapshotDTO:
+        """Снимок метрик; запросы отсортированы по суммарному времени"""
+        statements = [
+            StatementStatsDTO(sql, stats.count, stats.errors, stats.rows, stats.total_ms, stats.max_ms,
+                              tuple(stats.buckets))
+            for sql, stats in self._statements.items()
+        ]
+        statements.sort(key=lambda item: item.total_ms, reverse=True)
+        pool = PoolStatsDTO(self._acquire.count, self._saturated, self._acquire.total_ms, self._acquire.max_ms,
+                            tuple(self._acquire.buckets), *self._pool_state)
+        return MetricsSnapshotDTO(statements, pool)
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        """Снимок метрик в JSON"""
+        snapshot = self.snapshot()
+        return json.dumps({
+            "buckets_ms": list(LATENCY_BUCKETS_MS),
+            "statements": [asdict(item) for item in snapshot.statements],
+            "pool": asdict(snapshot.pool),
+        }, ensure_ascii=False, indent=indent)
+
+    def to_prometheus(self, prefix: str = "db") -> str:
+        """Снимок метрик в текстовом формате Prometheus"""
+        snapshot = self.snapshot()
+        lines = [f"# TYPE {prefix}_query_duration_seconds histogram"]
+        for item in snapshot.statements:
+            labels = f'query="{_escape_label(item.sql)}"'
+            lines.extend(_histogram_lines(f"{prefix}_query_duration_seconds", labels, item.buckets,
+                                          item.total_ms, item.calls))
+        for name, attr in (("query_rows_total", "rows"), ("query_errors_total", "errors")):
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            lines.extend(f'{prefix}_{name}{{query="{_escape_label(item.sql)}"}} {getattr(item, attr)}'
+                         for item in snapshot.statements)
+        pool = snapshot.pool
+        lines.append(f"# TYPE {prefix}_pool_acquire_seconds histogram")
+        lines.extend(_histogram_lines(f"{prefix}_pool_acquire_seconds", "", pool.buckets,
+                                      pool.total_wait_ms, pool.acquires))
+        lines.append(f"# TYPE {prefix}_pool_saturated_total counter")
+        lines.append(f"{prefix}_pool_saturated_total {pool.saturated}")
+        for name, value in (("pool_in_use", pool.in_use), ("pool_size", pool.size), ("pool_max_size", pool.max_size)):
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(name: str, labels: str, buckets: Tuple[int, ...], total_ms: float, count: int) -> List[str]:
+    """Кумулятивные корзины, сумма и счётчик гистограммы Prometheus (в секундах)"""
+    separator = "," if labels else ""
+    lines = []
+    cumulative = 0
+    for bound, bucket in zip(LATENCY_BUCKETS_MS, buckets):
+        cumulative += bucket
+        lines.append(f'{name}_bucket{{{labels}{separator}le="{bound / 1000}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels}{separator}le="+Inf"}} {count}')
+    braces = f"{{{labels}}}" if labels else ""
+    lines.append(f"{name}_sum{braces} {total_ms / 1000}")
+    lines.append(f"{name}_count{braces} {count}")
+    return lines
+
+
+def _status_rows(status: Any) -> Optional[int]:
+    """Число строк из статуса команды asyncpg: 'INSERT 0 5' -> 5, 'COPY 10' -> 10"""
+    if isinstance(status, str):
+        last = status.rsplit(" ", 1)[-1]
+        if last.isdigit():
+            return int(last)
+    return None
+
+
+class InstrumentedConnection:
+    """
+    Обёртка над asyncpg.Connection, замеряющая execute/executemany/fetch*/copy_*.
+    Остальные атрибуты (transaction, cursor, prepare и т.д.) отдаются от исходного соединения без замеров.
+    """
+
+    def __init__(self, connection, metrics: QueryMetrics):
+        self._connection = connection
+        self._metrics = metrics
+
+    def __getattr__(self, name: str):
+        return getattr(self._connection, name)
+
+    async def execute(self, query: str, *args, **kwargs):
+        return await self._timed(query, self._connection.execute(query, *args, **kwargs), _status_rows)
+
+    async def executemany(self, command: str, args, **kwargs):
+        rows = len(args) if hasattr(args, "__len__") else None
+        return await self._timed(command, self._connection.executemany(command, args, **kwargs), lambda _: rows)
+
+    async def fetch(self, query: str, *args, **kwargs):
+        return await self._timed(query, self._connection.fetch(query, *args, **kwargs), len)
+
+    async def fetchrow(self, query: str, *args, **kwargs):
+        return await self._timed(query, self._connection.fetchrow(query, *args, **kwargs),
+                                 lambda row: int(row is not None))
+
+    async def fetchval(self, query: str, *args, **kwargs):
+        return await self._timed(query, self._connection.fetchval(query, *args, **kwargs),
+                                 lambda value: int(value is not None))
+
+    async def copy_records_to_table(self, table_name: str, **kwargs):
+        return await self._timed(f"COPY {table_name} FROM STDIN (records)",
+                                 self._connection.copy_records_to_table(table_name, **kwargs), _status_rows)
+
+    async def copy_to_table(self, table_name: str, **kwargs):
+        return await self._timed(f"COPY {table_name} FROM STDIN",
+                                 self._connection.copy_to_table(table_name, **kwargs), _status_rows)
+
+    async def _timed(self, sql: str, call: Awaitable, rows_of: Callable[[Any], Optional[int]]):
+        started = time.perf_counter()
+        try:
+            result = await call
+        except Exception:
+            self._metrics.record_query(sql, (time.perf_counter() - started) * 1000, failed=True)
+            raise
+        self._metrics.record_query(sql, (time.perf_counter() - started) * 1000, rows_of(result))
+        return result
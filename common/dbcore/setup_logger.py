@@ -0,0 +1,277 @@
+import logging
+import asyncio
+import functools
+import inspect
+import reprlib
+import time
+from bisect import bisect_left
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+
+def configure(level=logging.DEBUG):
+    """
+    Настраивает базовую конфигурацию логирования с указанным уровнем.
+
+    Args:
+        level (int, optional): Уровень логирования (например, logging.DEBUG). По умолчанию logging.DEBUG.
+    """
+    logging.basicConfig(
+        level=level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+
+def decorate_all_methods(cls):
+    """
+    Декорирует все методы класса логирующим декоратором `log_method_call`, кроме метода `__repr__`.
+
+    staticmethod и classmethod не декорируются: у них первый аргумент не экземпляр класса,
+    и в лог попало бы чужое имя класса. Свойства и вложенные классы тоже пропускаются.
+
+    Args:
+        cls (type): Класс для декорирования.
+
+    Returns:
+        type: Класс с задекорированными методами.
+    """
+    for attr_name, attr_value in cls.__dict__.items():
+        if inspect.isfunction(attr_value) and attr_name != '__repr__':
+            decorated = log_method_call(attr_value)
+            setattr(cls, attr_name, decorated)
+    return cls
+
+
+class Logger:
+    """
+    Обёртка над стандартным модулем logging для удобства вызова методов логирования.
+    """
+
+    def __init__(self, name: str = __name__):
+        """
+        Инициализация логгера с заданным именем.
+
+        Args:
+            name (str): Имя логгера. По умолчанию используется имя текущего модуля.
+        """
+        self.logger = logging.getLogger(name)
+
+    def debug(self, msg: str):
+        """Логирует сообщение с уровнем DEBUG."""
+        self.logger.debug(msg)
+
+    def info(self, msg: str):
+        """Логирует сообщение с уровнем INFO."""
+        self.logger.info(msg)
+
+    def warning(self, msg: str):
+        """Логирует сообщение с уровнем WARNING."""
+        self.logger.warning(msg)
+
+    def error(self, msg: str):
+        """Логирует сообщение с уровнем ERROR."""
+        self.logger.error(msg)
+
+    def critical(self, msg: str):
+        """Логирует сообщение с уровнем CRITICAL."""
+        self.logger.critical(msg)
+
+
+log = Logger(__name__)
+
+
+# Границы корзин гистограммы задержек, мс; последняя корзина - всё, что дольше
+LATENCY_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+_arg_repr = reprlib.Repr()
+_arg_repr.maxlist = _arg_repr.maxtuple = _arg_repr.maxset = _arg_repr.maxdict = 5
+_arg_repr.maxstring = _arg_repr.maxother = 120
+
+
+@dataclass(frozen=True)
+class MethodStatsDTO:
+    """Счётчики вызовов метода"""
+    method: str
+    calls: int
+    errors: int
+    total_ms: float
+    max_ms: float
+    buckets: Tuple[int, ...]
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+    def __str__(self):
+        histogram = ", ".join(
+            f"<={bound}: {count}" for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets) if count)
+        if self.buckets[-1]:
+            histogram += f"{', ' if histogram else ''}>{LATENCY_BUCKETS_MS[-1]}: {self.buckets[-1]}"
+        return (f"{self.method}: вызовов {self.calls}, ошибок {self.errors}, среднее {self.avg_ms:.2f} мс, "
+                f"максимум {self.max_ms:.2f} мс [{histogram}]")
+
+
+class _MethodStats:
+    """Накопитель числа вызовов и гистограммы задержек одного метода"""
+
+    __slots__ = ("calls", "errors", "total_ms", "max_ms", "buckets")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, elapsed_ms: float, failed: bool) -> None:
+        self.calls += 1
+        self.errors += failed
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+
+
+_method_stats: Dict[str, _MethodStats] = {}
+
+
+def enable_tracing(cls, enabled: bool = True) -> None:
+    """
+    Включает или выключает трассировку (логирование вызовов и сбор статистики) для класса во время работы.
+
+    Args:
+        cls (type): Класс, методы которого задекорированы.
+        enabled (bool): True - трассировать, False - вызывать методы без накладных расходов.
+    """
+    cls._tracing_enabled = enabled
+
+
+def get_method_stats() -> List[MethodStatsDTO]:
+    """
+    Снимок статистики вызовов всех трассируемых методов.
+
+    Returns:
+        List[MethodStatsDTO]: Статистика, отсортированная по суммарному времени (самые дорогие первыми).
+    """
+    snapshot = [MethodStatsDTO(name, stats.calls, stats.errors, stats.total_ms, stats.max_ms, tuple(stats.buckets))
+                for name, stats in _method_stats.items() if stats.calls]
+    return sorted(snapshot, key=lambda item: item.total_ms, reverse=True)
+
+
+def reset_method_stats() -> None:
+    """Обнуляет статистику вызовов (накопители остаются теми же, что захвачены декорированными методами)."""
+    for stats in _method_stats.values():
+        stats.reset()
+
+
+def _format_arguments(signature: inspect.Signature, args, kwargs) -> str:
+    """Аргументы вызова без self; длинные значения и коллекции обрезаются, у коллекций указывается размер"""
+    params = signature.bind(*args, **kwargs)
+    params.apply_defaults()
+    params.arguments.pop('self', None)
+    parts = []
+    for name, value in params.arguments.items():
+        text = _arg_repr.repr(value)
+        if isinstance(value, (list, tuple, set, frozenset, dict)) and len(value) > _arg_repr.maxlist:
+            text = f"<{type(value).__name__} len={len(value)}> {text}"
+        parts.append(f"{name!r}: {text}")
+    return "{" + ", ".join(parts) + "}"
+
+
+def log_method_call(func):
+    """
+    Декоратор, логирующий вызовы функции, асинхронной корутины или асинхронного генератора.
+
+    Логирует имя класса, имя метода и аргументы вызова, а также факт завершения метода,
+    и собирает число вызовов и гистограмму задержек (см. get_method_stats).
+    Для асинхронного генератора замеряется вся итерация, от первого элемента до исчерпания или закрытия.
+    Сигнатура вычисляется один раз при декорировании, аргументы форматируются только при включённом DEBUG.
+    Для класса, выключенного через enable_tracing, метод вызывается напрямую.
+
+    Args:
+        func (callable): Функция или корутина для декорирования.
+
+    Returns:
+        callable: Обёртка вокруг исходной функции с логированием.
+    """
+    signature = inspect.signature(func)
+    func_name = func.__name__
+    stats = _method_stats.setdefault(func.__qualname__, _MethodStats())
+    logger = log.logger
+
+    if inspect.isasyncgenfunction(func):
+        @functools.wraps(func)
+        async def async_gen_wrapper(*args, **kwargs):
+            if not getattr(args[0], '_tracing_enabled', True):
+                async with aclosing(func(*args, **kwargs)) as items:
+                    async for item in items:
+                        yield item
+                return
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                cls_name = args[0].__class__.__name__
+                logger.debug(f"{cls_name}.{func_name} вызвано с args={_format_arguments(signature, args, kwargs)}")
+            failed = True
+            started = time.perf_counter()
+            try:
+                async with aclosing(func(*args, **kwargs)) as items:
+                    async for item in items:
+                        yield item
+                failed = False
+            except GeneratorExit:
+                # Потребитель прекратил итерацию досрочно - это не ошибка метода
+                failed = False
+                raise
+            finally:
+                stats.record((time.perf_counter() - started) * 1000, failed)
+            if debug:
+                logger.debug(f"{cls_name}.{func_name} завершено")
+
+        return async_gen_wrapper
+    elif asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if not getattr(args[0], '_tracing_enabled', True):
+                return await func(*args, **kwargs)
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                cls_name = args[0].__class__.__name__
+                logger.debug(f"{cls_name}.{func_name} вызвано с args={_format_arguments(signature, args, kwargs)}")
+            failed = True
+            started = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+                failed = False
+            finally:
+                stats.record((time.perf_counter() - started) * 1000, failed)
+            if debug:
+                logger.debug(f"{cls_name}.{func_name} завершено")
+            return result
+
+        return async_wrapper
+    else:
+        @functools.wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            if not getattr(args[0], '_tracing_enabled', True):
+                return func(*args, **kwargs)
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                cls_name = args[0].__class__.__name__
+                logger.debug(f"{cls_name}.{func_name} вызвано с args={_format_arguments(signature, args, kwargs)}")
+            failed = True
+            started = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+            finally:
+                stats.record((time.perf_counter() - started) * 1000, failed)
+            if debug:
+                logger.debug(f"{cls_name}.{func_name} завершено")
+            return result
+
+        return sync_wrapper
@@ -0,0 +1,47 @@
+import asyncio
+import random
+import sys
+
+from dbcore.bench import benchmark_pools
+from dbcore.config import DatabaseConfig
+from dbcore.connector import DatabaseConnection
+from src.database.employee_repository import EmployeeRepository
+
+CONCURRENCY = 64
+DURATION = 10.0
+NAMES = ("Иван", "Анна", "Петр", "Мария", "Сергей")
+
+
+def employee_requests(db: DatabaseConnection):
+    """Смешанная нагрузка чтения: узкий диапазон зарплат по индексу и поиск по имени"""
+    repo = EmployeeRepository(db)
+
+    async def request(rnd: random.Random) -> None:
+        if rnd.random() < 0.7:
+            low = rnd.randint(20_000, 300_000)
+            await repo.get_by_salary_range(low, low + 1000)
+        else:
+            await repo.get_by_name(rnd.choice(NAMES))
+
+    return request
+
+
+async def main(config: DatabaseConfig, concurrency: int, duration: float):
+    db = DatabaseConnection(config)
+    await db.connect()
+    try:
+        await EmployeeRepository(db).initialize()
+    finally:
+        await db.close()
+
+    await benchmark_pools(config, employee_requests, concurrency, duration)
+
+
+if __name__ == "__main__":
+    # Нагрузочный тест только читает employees; данные можно залить bench_salary_range.py.
+    # Число клиентов и длительность можно передать аргументами: python bench_pool.py 128 30
+    # Подключение задаётся переменными окружения DB_HOST, DB_PORT, DB_USER, DB_PASSWORD и DB_NAME
+    config = DatabaseConfig.from_env()
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else CONCURRENCY
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else DURATION
+    asyncio.run(main(config, concurrency, duration))
@@ -0,0 +1,69 @@
+import asyncio
+import random
+import statistics
+import sys
+import time
+
+from dbcore.config import DatabaseConfig
+from dbcore.connector import DatabaseConnection
+from src.database.employee_repository import SELECT_BY_SALARY_RANGE_SQL, EmployeeRepository
+
+ROWS = 1_000_000
+REPEATS = 5
+POSITIONS = ("Разработчик", "Аналитик", "Тестировщик", "Менеджер", "Дизайнер")
+# Диапазоны разной селективности: от десятков строк до нескольких процентов таблицы
+RANGES = ((100_000, 100_010), (100_000, 101_000), (100_000, 110_000), (100_000, 150_000))
+
+
+def generate_employees(count: int):
+    rnd = random.Random(count)
+    for i in range(count):
+        yield f"Сотрудник {i}", rnd.choice(POSITIONS), rnd.randint(20_000, 300_000)
+
+
+async def median_ms(call, repeats: int = REPEATS) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def main(config: DatabaseConfig, rows: int):
+    db = DatabaseConnection(config)
+    await db.connect()
+    try:
+        repo = EmployeeRepository(db)
+        await repo.initialize()
+        async with db.connection() as conn:
+            existing = await conn.fetchval("SELECT count(*) FROM employees")
+        if existing < rows:
+            await repo.add_employees(generate_employees(rows - existing))
+        async with db.connection() as conn:
+            await conn.execute("ANALYZE employees")
+
+        async def seq_scan(low: int, high: int):
+            # Тот же запрос, но планировщику запрещено использовать индекс
+            async with db.connection() as conn:
+                async with conn.transaction():
+                    await conn.execute("SET LOCAL enable_indexscan = off; SET LOCAL enable_bitmapscan = off")
+                    return await conn.fetch(SELECT_BY_SALARY_RANGE_SQL, low, high)
+
+        print(f"Строк в таблице: {max(existing, rows)}, медиана из {REPEATS} запусков\n")
+        print(f"{'диапазон':<18} | {'строк':>8} | {'seq scan, мс':>12} | {'индекс, мс':>10}")
+        for low, high in RANGES:
+            found = len(await repo.get_by_salary_range(low, high))
+            old = await median_ms(lambda: seq_scan(low, high))
+            new = await median_ms(lambda: repo.get_by_salary_range(low, high))
+            print(f"{f'{low}-{high}':<18} | {found:>8} | {old:>12.1f} | {new:>10.1f}")
+    finally:
+        await db.close()
+
+
+if __name__ == "__main__":
+    # Внимание: скрипт дописывает синтетических сотрудников в таблицу employees.
+    # Размер таблицы можно передать аргументом: python bench_salary_range.py 500000
+    # Подключение задаётся переменными окружения DB_HOST, DB_PORT, DB_USER, DB_PASSWORD и DB_NAME
+    config = DatabaseConfig.from_env()
+    asyncio.run(main(config, int(sys.argv[1]) if len(sys.argv) > 1 else ROWS))
@@ -1,13 +1,14 @@
 import sys
 import asyncio
+import logging
 from typing import Optional
 
-from src.config_models import DatabaseConfig
-from src.database.connector import DatabaseConnection
+from dbcore.config import DatabaseConfig, metrics_enabled
+from dbcore.connector import DatabaseConnection
 from src.database.employee_repository import EmployeeRepository
-from src.logger_setup import LoggerConfigurator
+from dbcore.setup_logger import configure
 
-LoggerConfigurator.configure()
+configure(logging.INFO)
 
 if sys.platform == "win32":
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
@@ -47,6 +48,9 @@ async def start_script(config: DatabaseConfig, new_employee: Optional[dict] = No
 
         employee = await repo.delete_by_name("Анна")
         print('После:', employee)
+
+        if db_connection.metrics is not None:
+            logging.info(str(db_connection.metrics.snapshot()))
     finally:
         await db_connection.close()
 
@@ -75,6 +79,8 @@ if __name__ == "__main__":
         port=5432,
         user="postgres",
         password="AV123",
-        database="employees"
+        database="employees",
+        # DB_METRICS=1 - собирать метрики запросов и пула и вывести их в конце
+        metrics=metrics_enabled()
     )
     asyncio.run(start_script(config, new_employee, new_employees))
@@ -1,18 +1,37 @@
 import logging
-from typing import List, Tuple, Optional
+from typing import AsyncIterable, Iterable, List, Tuple, Optional, Union
 
-from src.database.connector import DatabaseConnection
+from dbcore.base_repository import BaseRepository
+from dbcore.bulk import chunked
+from dbcore.connector import DatabaseConnection
+from src.models import Employee
 
+EmployeeRow = Tuple[str, str, int]
 
-class EmployeeRepository:
+# Тексты запросов неизменны, поэтому asyncpg готовит каждый один раз на соединение и дальше берёт из кеша
+SELECT_BY_SALARY_RANGE_SQL = """
+    SELECT name, position, salary
+    FROM employees
+    WHERE salary BETWEEN $1 AND $2
+    ORDER BY salary
+"""
+SELECT_BY_NAME_SQL = "SELECT name, position, salary FROM employees WHERE name = $1 ORDER BY id LIMIT 1"
+UPDATE_SALARY_BY_NAME_SQL = "UPDATE employees SET salary = $2 WHERE name = $1 RETURNING name, position, salary"
+DELETE_BY_NAME_SQL = "DELETE FROM employees WHERE name = $1 RETURNING name, position, salary"
+
+
+class EmployeeRepository(BaseRepository):
     """Репозиторий для работы с сотрудниками в БД"""
 
+    # С какого размера пачки COPY выгоднее executemany
+    COPY_THRESHOLD = 1000
+
     def __init__(self, db_connection: DatabaseConnection):
-        self._db = db_connection
+        super().__init__(db_connection)
 
     async def initialize(self) -> None:
         """Инициализация таблиц"""
-        async with self._db.connection() as conn:
+        async with self.db.connection() as conn:
             await conn.execute("""
                 CREATE TABLE IF NOT EXISTS employees (
                     id SERIAL PRIMARY KEY,
@@ -21,11 +40,15 @@ class EmployeeRepository:
                     salary INTEGER NOT NULL
                 )
             """)
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS ix_employees_salary ON employees (salary);
+                CREATE INDEX IF NOT EXISTS ix_employees_name ON employees (name);
+            """)
             logging.info("Таблица 'employees' инициализирована или уже существует")
 
     async def add_employee(self, employee_data: dict) -> None:
         """Добавление нового сотрудника"""
-        async with self._db.connection() as conn:
+        async with self.db.connection() as conn:
             await conn.execute(
                 "INSERT INTO employees (name, position, salary) VALUES ($1, $2, $3)",
                 employee_data['name'], employee_data['position'], employee_data['salary']
@@ -33,19 +56,57 @@ class EmployeeRepository:
             logging.info(f"Добавлен сотрудник: {employee_data['name']}, "
                          f"должность: {employee_data['position']}, зарплата: {employee_data['salary']}")
 
-    async def add_employees(self, employees_data: Tuple[Tuple[str, str, int], ...]) -> None:
-        """Добавление новых сотрудников"""
-        async with self._db.connection() as conn:
-            placeholders = []
-            values = []
-            param_index = 1
-            for employee in employees_data:
-                placeholders.append(f"(${param_index}, ${param_index+1}, ${param_index+2})")
-                values.extend(employee)
-                param_index += 3
-            query = f"""
-                INSERT INTO employees (name, position, salary)
-                VALUES {', '.join(placeholders)}
-            """
-            await conn.execute(query, *values)
-            logging.info(f"Добавлено сотрудников: {len(employees_data)}")
+    async def add_employees(self, employees_data: Union[Iterable[EmployeeRow], AsyncIterable[EmployeeRow]],
+                            chunk_size: int = 10_000) -> int:
+        """
+        Добавление новых сотрудников одной транзакцией.
+        employees_data - кортежи (name, position, salary): кортеж кортежей, генератор или асинхронный итератор.
+        Поток читается пачками по chunk_size: крупные пачки грузятся через COPY, мелкие - executemany
+        с одним и тем же текстом запроса, поэтому лимит параметров не достигается и prepared statement переиспользуется.
+        Возвращает количество добавленных сотрудников.
+        """
+        added = 0
+        async with self.db.connection() as conn:
+            async with conn.transaction():
+                async for chunk in chunked(employees_data, chunk_size):
+                    if len(chunk) >= self.COPY_THRESHOLD:
+                        await conn.copy_records_to_table(
+                            "employees", records=chunk, columns=["name", "position", "salary"])
+                    else:
+                        await conn.executemany(
+                            "INSERT INTO employees (name, position, salary) VALUES ($1, $2, $3)", chunk)
+                    added += len(chunk)
+            logging.info(f"Добавлено сотрудников: {added}")
+        return added
+
+    async def get_by_salary_range(self, min_salary: int, max_salary: int) -> List[Employee]:
+        """Сотрудники с зарплатой в диапазоне [min_salary; max_salary], по возрастанию зарплаты"""
+        async with self.db.connection() as conn:
+            rows = await conn.fetch(SELECT_BY_SALARY_RANGE_SQL, min_salary, max_salary)
+            logging.info(f"Найдено сотрудников с зарплатой от {min_salary} до {max_salary}: {len(rows)}")
+            return [Employee(*row) for row in rows]
+
+    async def get_by_name(self, name: str) -> Optional[Employee]:
+        """Сотрудник по имени (первый добавленный, если имя повторяется)"""
+        async with self.db.connection() as conn:
+            row = await conn.fetchrow(SELECT_BY_NAME_SQL, name)
+            if row is None:
+                logging.info(f"Сотрудник {name} не найден")
+                return None
+            logging.info(f"Найден сотрудник: {name}")
+            return Employee(*row)
+
+    async def update_salary_by_name(self, employee_data: dict) -> List[Employee]:
+        """Обновление зарплаты по имени, возвращает обновлённых сотрудников"""
+        async with self.db.connection() as conn:
+            rows = await conn.fetch(UPDATE_SALARY_BY_NAME_SQL, employee_data['name'], employee_data['salary'])
+            logging.info(f"Обновлена зарплата сотрудников {employee_data['name']}: {len(rows)}, "
+                         f"новая зарплата: {employee_data['salary']}")
+            return [Employee(*row) for row in rows]
+
+    async def delete_by_name(self, name: str) -> List[Employee]:
+        """Удаление сотрудников по имени, возвращает удалённых"""
+        async with self.db.connection() as conn:
+            rows = await conn.fetch(DELETE_BY_NAME_SQL, name)
+            logging.info(f"Удалено сотрудников {name}: {len(rows)}")
+            return [Employee(*row) for row in rows]
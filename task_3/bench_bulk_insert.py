@@ -0,0 +1,56 @@
+import asyncio
+import random
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from dbcore.config import DatabaseConfig
+from dbcore.connector import DatabaseConnection
+from src.database.order_repository import OrdersRepository
+
+ORDER_COUNTS = (1_000, 100_000, 10_000_000)
+CUSTOMERS = 100_000
+
+
+def generate_orders(count: int):
+    """Генератор синтетических заказов: поток не материализуется целиком"""
+    rnd = random.Random(count)
+    first_day = date(2020, 1, 1)
+    for _ in range(count):
+        yield {
+            "customer_id": rnd.randint(1, CUSTOMERS),
+            "order_date": first_day + timedelta(days=rnd.randint(0, 5 * 365)),
+            "amount": Decimal(rnd.randint(100, 1_000_000)) / 100,
+        }
+
+
+async def measure(repo: OrdersRepository, count: int, copy_threshold: int) -> float:
+    started = time.perf_counter()
+    await repo.bulk_insert_orders(generate_orders(count), copy_threshold=copy_threshold)
+    return time.perf_counter() - started
+
+
+async def main(config: DatabaseConfig, order_counts):
+    db = DatabaseConnection(config)
+    await db.connect()
+    try:
+        repo = OrdersRepository(db)
+        await repo.initialize()
+        print(f"{'заказов':>12} | {'executemany, с':>15} | {'COPY, с':>9} | {'ускорение':>9}")
+        for count in order_counts:
+            # Порог больше размера батча - всегда executemany, нулевой - всегда COPY
+            executemany = await measure(repo, count, copy_threshold=sys.maxsize)
+            copy = await measure(repo, count, copy_threshold=0)
+            print(f"{count:>12} | {executemany:>15.2f} | {copy:>9.2f} | {executemany / copy:>8.1f}x")
+    finally:
+        await db.close()
+
+
+if __name__ == "__main__":
+    # Внимание: скрипт дописывает синтетические заказы в таблицу orders.
+    # Количество заказов можно передать аргументами: python bench_bulk_insert.py 1000 100000
+    # Подключение задаётся переменными окружения DB_HOST, DB_PORT, DB_USER, DB_PASSWORD и DB_NAME
+    config = DatabaseConfig.from_env()
+    counts = tuple(int(arg) for arg in sys.argv[1:]) or ORDER_COUNTS
+    asyncio.run(main(config, counts))
@@ -0,0 +1,51 @@
+import asyncio
+import random
+import sys
+from datetime import date
+
+from dbcore.bench import benchmark_pools
+from dbcore.config import DatabaseConfig
+from dbcore.connector import DatabaseConnection
+from src.database.order_repository import OrdersRepository
+
+CONCURRENCY = 64
+DURATION = 10.0
+YEARS = range(2020, 2026)
+
+
+def orders_requests(db: DatabaseConnection):
+    """Смешанная нагрузка чтения: счётчик за год, помесячный ряд и топ-клиент"""
+    repo = OrdersRepository(db)
+
+    async def request(rnd: random.Random) -> None:
+        year = rnd.choice(YEARS)
+        choice = rnd.random()
+        if choice < 0.5:
+            await repo.get_orders_count_for_year(year)
+        elif choice < 0.8:
+            await repo.count_orders(OrdersRepository.PERIOD_MONTH, date(year, 1, 1), date(year + 1, 1, 1))
+        else:
+            await repo.get_customer_with_max_total()
+
+    return request
+
+
+async def main(config: DatabaseConfig, concurrency: int, duration: float):
+    db = DatabaseConnection(config)
+    await db.connect()
+    try:
+        await OrdersRepository(db).initialize()
+    finally:
+        await db.close()
+
+    await benchmark_pools(config, orders_requests, concurrency, duration)
+
+
+if __name__ == "__main__":
+    # Нагрузочный тест только читает orders; данные можно залить bench_bulk_insert.py.
+    # Число клиентов и длительность можно передать аргументами: python bench_pool.py 128 30
+    # Подключение задаётся переменными окружения DB_HOST, DB_PORT, DB_USER, DB_PASSWORD и DB_NAME
+    config = DatabaseConfig.from_env()
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else CONCURRENCY
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else DURATION
+    asyncio.run(main(config, concurrency, duration))
@@ -1,13 +1,13 @@
 import asyncio
 from datetime import date
 import logging
-from src.logger_setup import LoggerConfigurator
-from src.database.connector import DatabaseConnection
+from dbcore.setup_logger import configure
+from dbcore.connector import DatabaseConnection
 from src.database.order_repository import OrdersRepository
-from src.config_model import DatabaseConfig
+from dbcore.config import DatabaseConfig, metrics_enabled
 
 logging.disable(logging.CRITICAL)
-LoggerConfigurator.configure()
+configure(logging.INFO)
 
 
 async def start_script(config, new_orders, year):
@@ -25,21 +25,28 @@ async def start_script(config, new_orders, year):
         # Вставка нескольких заказов (массив словарей с ключами: customer_id, order_date, amount)
         await orders_repo.bulk_insert_orders(new_orders)
 
-        total_by_customer = await orders_repo.get_total_sum_by_customer()
+        report = await orders_repo.get_report(year)
         print("Общая сумма заказов по клиентам:")
-        for item in total_by_customer:
+        for item in report.totals:
             print(str(item))
 
         print('\n')
-        max_customer = await orders_repo.get_customer_with_max_total()
-        print(str(max_customer), '\n')
+        print(str(report.top_customer), '\n')
 
-        orders_count_year = await orders_repo.get_orders_count_for_year(year)
-        print(str(orders_count_year), '\n')
+        print(str(report.year_count), '\n')
 
-        avg_amount_by_customer = await orders_repo.get_avg_amount_by_customer()
-        for item in avg_amount_by_customer:
+        orders_by_quarter = await orders_repo.count_orders(
+            OrdersRepository.PERIOD_QUARTER, date(year, 1, 1), date(year + 1, 1, 1))
+        for item in orders_by_quarter:
             print(str(item))
+        print('\n')
+
+        for item in report.averages:
+            print(str(item))
+
+        if db_connection.metrics is not None:
+            print('\n')
+            print(str(db_connection.metrics.snapshot()))
 
     except Exception as e:
         logging.error(e)
@@ -67,7 +74,9 @@ if __name__ == "__main__":
         port=5432,
         user="postgres",
         password="AV123",
-        database="employees"
+        database="employees",
+        # DB_METRICS=1 - собирать метрики запросов и пула и вывести их в конце
+        metrics=metrics_enabled()
     )
     # Год сбора данных
     year = 2023
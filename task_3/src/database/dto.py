@@ -1,5 +1,7 @@
 from dataclasses import dataclass
+from datetime import date
 from decimal import Decimal
+from typing import List, Optional
 
 
 @dataclass(frozen=True)
@@ -29,6 +31,24 @@ class OrdersCountDTO:
         return f"Количество заказов за {self.year} год: {self.orders_count}"
 
 
+@dataclass(frozen=True)
+class OrdersPeriodCountDTO:
+    period: str
+    period_start: date
+    orders_count: int
+
+    @property
+    def label(self) -> str:
+        if self.period == "month":
+            return self.period_start.strftime("%Y-%m")
+        if self.period == "quarter":
+            return f"{self.period_start.year} Q{(self.period_start.month - 1) // 3 + 1}"
+        return str(self.period_start.year)
+
+    def __str__(self):
+        return f"Количество заказов за {self.label}: {self.orders_count}"
+
+
 @dataclass(frozen=True)
 class CustomerAvgDTO:
     customer_id: int
@@ -36,3 +56,24 @@ class CustomerAvgDTO:
 
     def __str__(self):
         return f"Средняя сумма заказов по клиенту {self.customer_id}: {self.avg_amount:.2f}"
+
+
+@dataclass(frozen=True)
+class CustomerStatsDiffDTO:
+    customer_id: int
+    expected_total: Optional[Decimal]
+    actual_total: Optional[Decimal]
+    expected_count: int
+    actual_count: int
+
+    def __str__(self):
+        return (f"Расхождение по клиенту {self.customer_id}: сумма {self.actual_total} (ожидалось {self.expected_total}), "
+                f"заказов {self.actual_count} (ожидалось {self.expected_count})")
+
+
+@dataclass(frozen=True)
+class OrdersReportDTO:
+    totals: List[CustomerTotalDTO]
+    top_customer: Optional[MaxCustomerTotalDTO]
+    year_count: OrdersCountDTO
+    averages: List[CustomerAvgDTO]
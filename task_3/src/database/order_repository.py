@@ -1,48 +1,136 @@
 import logging
-from typing import List, Optional
-from src.database.connector import DatabaseConnection
-from src.database.dto import CustomerAvgDTO, CustomerTotalDTO, MaxCustomerTotalDTO, OrdersCountDTO
+from collections import defaultdict
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Set, Union
 
+import asyncpg
 
-class OrdersRepository:
+from dbcore.base_repository import BaseRepository
+from dbcore.bulk import chunked
+from dbcore.connector import DatabaseConnection
+from src.database.dto import (CustomerAvgDTO, CustomerStatsDiffDTO, CustomerTotalDTO, MaxCustomerTotalDTO,
+                              OrdersCountDTO, OrdersPeriodCountDTO, OrdersReportDTO)
+
+CENTS = Decimal("0.01")
+
+
+def _amount(value) -> Decimal:
+    """
+    Сумма заказа, округлённая до копеек, как в колонке NUMERIC(15, 2).
+    Одно и то же значение уходит и в orders, и в дельты customer_order_stats:
+    float asyncpg передаёт как Decimal(value), и PostgreSQL округлил бы двоичное значение иначе (2.675 -> 2.67).
+    """
+    return Decimal(str(value)).quantize(CENTS, ROUND_HALF_UP)
+
+
+async def _batches(orders: Union[Iterable[dict], AsyncIterable[dict]], size: int) -> AsyncIterator[List[tuple]]:
+    """
+    Разбивает синхронный или асинхронный поток заказов на списки кортежей (customer_id, order_date, amount),
+    amount - Decimal, округлённый до копеек
+    """
+    async for chunk in chunked(orders, size):
+        yield [(o["customer_id"], o["order_date"], _amount(o["amount"])) for o in chunk]
+
+
+def _period_start(day: date, period: str) -> date:
+    """Начало месяца или года, в который попадает day"""
+    return day.replace(day=1) if period == OrdersRepository.PERIOD_MONTH else day.replace(month=1, day=1)
+
+
+def _next_period(start: date, period: str) -> date:
+    """Начало следующего месяца или года"""
+    if period == OrdersRepository.PERIOD_YEAR:
+        return start.replace(year=start.year + 1)
+    return start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+
+
+def _partition_name(start: date, period: str) -> str:
+    return f"orders_{start:%Y}" if period == OrdersRepository.PERIOD_YEAR else f"orders_{start:%Y_%m}"
+
+
+class OrdersRepository(BaseRepository):
     """Репозиторий для работы с таблицей orders"""
 
-    def __init__(self, db_connection: DatabaseConnection):
-        self._db = db_connection
+    PERIOD_MONTH = "month"
+    PERIOD_QUARTER = "quarter"
+    PERIOD_YEAR = "year"
+    PERIOD_MONTHS = {PERIOD_MONTH: 1, PERIOD_QUARTER: 3, PERIOD_YEAR: 12}
+    # С какого размера батча COPY выгоднее executemany: ниже его накладные расходы на протокол не окупаются
+    COPY_THRESHOLD = 1000
+
+    def __init__(self, db_connection: DatabaseConnection, partitioning: Optional[str] = None):
+        """
+        partitioning - None для обычной таблицы orders либо PERIOD_MONTH / PERIOD_YEAR
+        для секционирования orders по диапазонам order_date
+        """
+        if partitioning not in (None, self.PERIOD_MONTH, self.PERIOD_YEAR):
+            raise ValueError(f"Секционирование возможно только по {self.PERIOD_MONTH} или {self.PERIOD_YEAR}")
+        super().__init__(db_connection)
+        self._partitioning = partitioning
+        self._partitions: Set[str] = set()
 
     async def initialize(self) -> None:
-        """Создание таблицы orders, если не существует"""
-        async with self._db.connection() as conn:
+        """Создание таблиц orders и customer_order_stats, если не существуют"""
+        async with self.db.connection() as conn:
+            if self._partitioning:
+                await self._initialize_partitioned(conn)
+            else:
+                await conn.execute("""
+                    CREATE TABLE IF NOT EXISTS orders (
+                        id SERIAL PRIMARY KEY,
+                        customer_id INT NOT NULL,
+                        order_date DATE NOT NULL,
+                        amount NUMERIC(15, 2) NOT NULL
+                    )
+                """)
+            await conn.execute("CREATE INDEX IF NOT EXISTS ix_orders_order_date ON orders (order_date)")
+            logging.info("Таблица 'orders' готова к работе")
+
             await conn.execute("""
-                CREATE TABLE IF NOT EXISTS orders (
-                    id SERIAL PRIMARY KEY,
-                    customer_id INT NOT NULL,
-                    order_date DATE NOT NULL,
-                    amount NUMERIC(15, 2) NOT NULL
-                )
+                CREATE TABLE IF NOT EXISTS customer_order_stats (
+                    customer_id INT PRIMARY KEY,
+                    total_amount NUMERIC NOT NULL,
+                    orders_count BIGINT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS ix_customer_order_stats_total
+                    ON customer_order_stats (total_amount DESC);
             """)
-            logging.info("Таблица 'orders' готова к работе")
+            stats_empty = not await conn.fetchval("SELECT EXISTS (SELECT 1 FROM customer_order_stats)")
+            if stats_empty and await conn.fetchval("SELECT EXISTS (SELECT 1 FROM orders)"):
+                await self._rebuild_customer_stats(conn)
+            logging.info("Таблица 'customer_order_stats' готова к работе")
 
     async def get_total_sum_by_customer(self) -> List[CustomerTotalDTO]:
-        """Общая сумма заказов по каждому клиенту"""
-        async with self._db.connection() as conn:
+        """Общая сумма заказов по каждому клиенту (из customer_order_stats, без прохода по orders)"""
+        async with self.db.connection() as conn:
             logging.info("Выполняется запрос: общая сумма заказов по клиентам")
             rows = await conn.fetch("""
-                SELECT customer_id, SUM(amount) AS total_amount
-                FROM orders
-                GROUP BY customer_id
+                SELECT customer_id, total_amount
+                FROM customer_order_stats
             """)
             logging.info(f"Получено записей: {len(rows)}")
             return [CustomerTotalDTO(**dict(row)) for row in rows]
 
+    async def iter_total_sum_by_customer(self, prefetch: int = 1000,
+                                         raw: bool = False) -> AsyncIterator[Union[CustomerTotalDTO, asyncpg.Record]]:
+        """
+        Потоковый вариант get_total_sum_by_customer: строки читаются курсором по prefetch штук.
+        raw=True отдаёт asyncpg.Record (распаковывается как кортеж customer_id, total_amount) без создания DTO.
+        """
+        async for row in self._iter_rows("""
+            SELECT customer_id, total_amount
+            FROM customer_order_stats
+        """, prefetch):
+            yield row if raw else CustomerTotalDTO(*row)
+
     async def get_customer_with_max_total(self) -> Optional[MaxCustomerTotalDTO]:
-        """Клиент с максимальной суммой заказов"""
-        async with self._db.connection() as conn:
+        """Клиент с максимальной суммой заказов (по индексу customer_order_stats.total_amount)"""
+        async with self.db.connection() as conn:
             logging.info("Выполняется запрос: клиент с максимальной суммой заказов")
             row = await conn.fetchrow("""
-                SELECT customer_id, SUM(amount) AS total_amount
-                FROM orders
-                GROUP BY customer_id
+                SELECT customer_id, total_amount
+                FROM customer_order_stats
                 ORDER BY total_amount DESC
                 LIMIT 1
             """)
@@ -54,43 +142,285 @@ class OrdersRepository:
             return None
 
     async def get_orders_count_for_year(self, year: int) -> OrdersCountDTO:
-        """Количество заказов за указанный год"""
-        async with self._db.connection() as conn:
+        """Количество заказов за указанный год (диапазон [1 января; 1 января следующего года))"""
+        async with self.db.connection() as conn:
             logging.info(f"Выполняется запрос: количество заказов за {year} год")
-            row = await conn.fetchrow("""
-                SELECT EXTRACT(YEAR FROM order_date) AS year, COUNT(*) AS orders_count
+            orders_count = await conn.fetchval("""
+                SELECT COUNT(*)
                 FROM orders
-                WHERE EXTRACT(YEAR FROM order_date) = $1
-                GROUP BY year
-            """, year)
-            if row:
-                logging.info(f"Найдено заказов за {year}: {row['orders_count']}")
-                return OrdersCountDTO(**dict(row))
-            logging.info(f"Заказов за {year} не найдено")
-            return OrdersCountDTO(year=year, orders_count=0)
+                WHERE order_date >= $1 AND order_date < $2
+            """, date(year, 1, 1), date(year + 1, 1, 1))
+            logging.info(f"Найдено заказов за {year}: {orders_count}")
+            return OrdersCountDTO(year=year, orders_count=orders_count)
+
+    async def count_orders(self, period: str, start: date, end: date) -> List[OrdersPeriodCountDTO]:
+        """
+        Количество заказов по периодам (month, quarter, year) в диапазоне [start; end) одним запросом.
+        Периоды без заказов возвращаются с нулём.
+        """
+        if period not in self.PERIOD_MONTHS:
+            raise ValueError(f"Неизвестный период: {period}, ожидается один из {list(self.PERIOD_MONTHS)}")
+        async with self.db.connection() as conn:
+            logging.info(f"Выполняется запрос: количество заказов по периодам {period} с {start} по {end}")
+            rows = await conn.fetch("""
+                SELECT s.period_start::date AS period_start, COALESCE(c.orders_count, 0) AS orders_count
+                FROM generate_series(
+                    date_trunc($1, $2::timestamp),
+                    $3::timestamp - interval '1 day',
+                    make_interval(months => $4)
+                ) AS s(period_start)
+                LEFT JOIN (
+                    SELECT date_trunc($1, order_date::timestamp) AS period_start, COUNT(*) AS orders_count
+                    FROM orders
+                    WHERE order_date >= $2 AND order_date < $3
+                    GROUP BY 1
+                ) c ON c.period_start = s.period_start
+                ORDER BY s.period_start
+            """, period, start, end, self.PERIOD_MONTHS[period])
+            logging.info(f"Получено периодов: {len(rows)}")
+            return [OrdersPeriodCountDTO(period=period, **dict(row)) for row in rows]
 
     async def get_avg_amount_by_customer(self) -> List[CustomerAvgDTO]:
-        """Средняя сумма заказов по каждому клиенту"""
-        async with self._db.connection() as conn:
+        """Средняя сумма заказов по каждому клиенту (из customer_order_stats)"""
+        async with self.db.connection() as conn:
             logging.info("Выполняется запрос: средняя сумма заказов по клиентам")
             rows = await conn.fetch("""
-                SELECT customer_id, AVG(amount) AS avg_amount
-                FROM orders
-                GROUP BY customer_id
+                SELECT customer_id, total_amount / orders_count AS avg_amount
+                FROM customer_order_stats
             """)
             logging.info(f"Получено записей: {len(rows)}")
             return [CustomerAvgDTO(**dict(row)) for row in rows]
 
-    async def bulk_insert_orders(self, orders: List[dict]) -> None:
+    async def iter_avg_amount_by_customer(self, prefetch: int = 1000,
+                                          raw: bool = False) -> AsyncIterator[Union[CustomerAvgDTO, asyncpg.Record]]:
+        """
+        Потоковый вариант get_avg_amount_by_customer: строки читаются курсором по prefetch штук.
+        raw=True отдаёт asyncpg.Record (распаковывается как кортеж customer_id, avg_amount) без создания DTO.
+        """
+        async for row in self._iter_rows("""
+            SELECT customer_id, total_amount / orders_count AS avg_amount
+            FROM customer_order_stats
+        """, prefetch):
+            yield row if raw else CustomerAvgDTO(*row)
+
+    async def _iter_rows(self, query: str, prefetch: int) -> AsyncIterator[asyncpg.Record]:
+        """Читает результат запроса курсором; соединение занято, пока итерация не закончится"""
+        async with self.db.connection() as conn:
+            logging.info(f"Выполняется потоковый запрос, prefetch={prefetch}")
+            count = 0
+            # Курсоры asyncpg работают только внутри транзакции
+            async with conn.transaction():
+                async for row in conn.cursor(query, prefetch=prefetch):
+                    count += 1
+                    yield row
+            logging.info(f"Потоковый запрос завершён, строк: {count}")
+
+    async def get_report(self, year: int) -> OrdersReportDTO:
+        """
+        Сводный отчёт одним запросом: суммы и средние по клиентам, клиент с максимальной суммой
+        и количество заказов за год. customer_order_stats читается один раз, отсортированным по сумме,
+        количество за год считается по индексу order_date.
+        """
+        async with self.db.connection() as conn:
+            logging.info(f"Выполняется запрос: сводный отчёт по заказам за {year} год")
+            rows = await conn.fetch("""
+                SELECT y.orders_count AS year_count, s.customer_id, s.total_amount,
+                       s.total_amount / s.orders_count AS avg_amount
+                FROM (
+                    SELECT COUNT(*) AS orders_count
+                    FROM orders
+                    WHERE order_date >= $1 AND order_date < $2
+                ) y
+                LEFT JOIN customer_order_stats s ON true
+                ORDER BY s.total_amount DESC
+            """, date(year, 1, 1), date(year + 1, 1, 1))
+            customers = [row for row in rows if row["customer_id"] is not None]
+            logging.info(f"Получено клиентов: {len(customers)}, заказов за {year}: {rows[0]['year_count']}")
+            return OrdersReportDTO(
+                totals=[CustomerTotalDTO(row["customer_id"], row["total_amount"]) for row in customers],
+                top_customer=MaxCustomerTotalDTO(customers[0]["customer_id"], customers[0]["total_amount"])
+                if customers else None,
+                year_count=OrdersCountDTO(year=year, orders_count=rows[0]["year_count"]),
+                averages=[CustomerAvgDTO(row["customer_id"], row["avg_amount"]) for row in customers],
+            )
+
+    async def bulk_insert_orders(self, orders: Union[Iterable[dict], AsyncIterable[dict]],
+                                 batch_size: int = 10_000, copy_threshold: Optional[int] = None) -> int:
+        """
+        Вставка заказов одной транзакцией, поток читается батчами по batch_size и целиком в память не попадает.
+        orders - список, генератор или асинхронный итератор словарей с ключами: customer_id, order_date, amount
+        Батч от copy_threshold строк (по умолчанию COPY_THRESHOLD) грузится бинарным COPY, меньший - executemany.
+        Агрегаты customer_order_stats обновляются в той же транзакции.
+        В секционированном режиме недостающие секции для дат заказов создаются до вставки.
+        Возвращает количество вставленных заказов.
+        """
+        copy_threshold = self.COPY_THRESHOLD if copy_threshold is None else copy_threshold
+        totals: Dict[int, Decimal] = defaultdict(Decimal)
+        counts: Dict[int, int] = defaultdict(int)
+        partitions: Set[str] = set()
+        inserted = 0
+        async with self.db.connection() as conn:
+            logging.info("Выполняется множественная вставка заказов")
+            async with conn.transaction():
+                async for values in _batches(orders, batch_size):
+                    if self._partitioning:
+                        await self._ensure_partitions(conn, {value[1] for value in values}, partitions)
+                    if len(values) >= copy_threshold:
+                        await conn.copy_records_to_table(
+                            "orders", records=values, columns=["customer_id", "order_date", "amount"])
+                    else:
+                        await conn.executemany("""
+                            INSERT INTO orders (customer_id, order_date, amount)
+                            VALUES ($1, $2, $3)
+                        """, values)
+                    for customer_id, _, amount in values:
+                        totals[customer_id] += amount
+                        counts[customer_id] += 1
+                    inserted += len(values)
+                if inserted:
+                    await self._apply_customer_stats(conn, totals, counts)
+            # Секции, созданные в откаченной транзакции, не существуют: запоминаем только после коммита
+            self._partitions |= partitions
+            logging.info(f"Множественная вставка завершена, заказов: {inserted}")
+        return inserted
+
+    async def create_partitions(self, ahead: int = 3, start: Optional[date] = None) -> List[str]:
+        """
+        Заранее создаёт секции orders: текущий период (или период start) и ещё ahead следующих.
+        Возвращает имена созданных секций.
+        """
+        if not self._partitioning:
+            raise RuntimeError("Таблица orders создана без секционирования")
+        period_start = _period_start(start or date.today(), self._partitioning)
+        starts = [period_start]
+        for _ in range(ahead):
+            starts.append(_next_period(starts[-1], self._partitioning))
+        partitions: Set[str] = set()
+        async with self.db.connection() as conn:
+            created = await self._ensure_partitions(conn, starts, partitions)
+        self._partitions |= partitions
+        return created
+
+    async def _initialize_partitioned(self, conn: asyncpg.Connection) -> None:
+        """Создаёт секционированную orders с секцией по умолчанию и загружает список секций"""
+        relkind = await conn.fetchval("SELECT relkind FROM pg_class WHERE oid = to_regclass('orders')")
+        if relkind is not None and relkind != "p":
+            raise RuntimeError("Таблица orders уже существует без секционирования, перенос данных не выполняется")
+        # Ключ секционирования обязан входить в первичный ключ
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS orders (
+                id SERIAL,
+                customer_id INT NOT NULL,
+                order_date DATE NOT NULL,
+                amount NUMERIC(15, 2) NOT NULL,
+                PRIMARY KEY (id, order_date)
+            ) PARTITION BY RANGE (order_date);
+            CREATE TABLE IF NOT EXISTS orders_default PARTITION OF orders DEFAULT;
+        """)
+        rows = await conn.fetch("""
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'orders'::regclass
+        """)
+        self._partitions = {row["relname"] for row in rows}
+        logging.info(f"Секций таблицы 'orders': {len(self._partitions)}")
+
+    async def _ensure_partitions(self, conn: asyncpg.Connection, days: Iterable[date],
+                                 partitions: Set[str]) -> List[str]:
+        """
+        Создаёт недостающие секции для периодов, в которые попадают days.
+        Строки этих периодов, уже лежащие в orders_default, переносятся в новую секцию.
+        Имена секций добавляются в partitions; в self._partitions их переносит вызывающий код
+        после коммита своей транзакции.
+        Секцию, параллельно созданную другим писателем, считает существующей.
+        """
+        created = []
+        for start in sorted({_period_start(day, self._partitioning) for day in days}):
+            name = _partition_name(start, self._partitioning)
+            if name in self._partitions or name in partitions:
+                continue
+            end = _next_period(start, self._partitioning)
+            try:
+                async with conn.transaction():
+                    if await conn.fetchval("SELECT to_regclass($1) IS NULL", name):
+                        await conn.execute(
+                            f"CREATE TABLE {name} (LIKE orders INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+                        await conn.execute(f"""
+                            WITH moved AS (
+                                DELETE FROM orders_default
+                                WHERE order_date >= $1 AND order_date < $2
+                                RETURNING *
+                            )
+                            INSERT INTO {name} SELECT * FROM moved
+                        """, start, end)
+                        await conn.execute(
+                            f"ALTER TABLE orders ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')")
+                        created.append(name)
+                        logging.info(f"Создана секция {name} [{start}; {end})")
+            except (asyncpg.DuplicateTableError, asyncpg.UniqueViolationError):
+                # Одновременный CREATE TABLE проигравшего писателя падает на каталоге:
+                # секция уже создана, откатывается только точка сохранения
+                logging.info(f"Секция {name} создана параллельно другим писателем")
+            partitions.add(name)
+        return created
+
+    async def verify_customer_stats(self) -> List[CustomerStatsDiffDTO]:
+        """
+        Сверка customer_order_stats со свежим GROUP BY по orders.
+        Возвращает клиентов, у которых агрегаты расходятся (пустой список — всё сходится).
+        """
+        async with self.db.connection() as conn:
+            logging.info("Выполняется сверка customer_order_stats с orders")
+            rows = await conn.fetch("""
+                WITH expected AS (
+                    SELECT customer_id, SUM(amount) AS total_amount, COUNT(*) AS orders_count
+                    FROM orders
+                    GROUP BY customer_id
+                )
+                SELECT COALESCE(e.customer_id, s.customer_id) AS customer_id,
+                       e.total_amount AS expected_total, s.total_amount AS actual_total,
+                       COALESCE(e.orders_count, 0) AS expected_count, COALESCE(s.orders_count, 0) AS actual_count
+                FROM expected e
+                FULL OUTER JOIN customer_order_stats s ON s.customer_id = e.customer_id
+                WHERE e.total_amount IS DISTINCT FROM s.total_amount
+                   OR e.orders_count IS DISTINCT FROM s.orders_count
+            """)
+            logging.info(f"Расхождений в customer_order_stats: {len(rows)}")
+            return [CustomerStatsDiffDTO(**dict(row)) for row in rows]
+
+    async def rebuild_customer_stats(self) -> None:
+        """Полный пересчёт customer_order_stats по таблице orders"""
+        async with self.db.connection() as conn:
+            await self._rebuild_customer_stats(conn)
+
+    @staticmethod
+    async def _rebuild_customer_stats(conn: asyncpg.Connection) -> None:
+        """Пересчёт агрегатов; orders блокируется от записи на время пересчёта"""
+        logging.info("Выполняется пересчёт customer_order_stats")
+        async with conn.transaction():
+            await conn.execute("LOCK TABLE orders IN SHARE MODE")
+            await conn.execute("TRUNCATE customer_order_stats")
+            await conn.execute("""
+                INSERT INTO customer_order_stats (customer_id, total_amount, orders_count)
+                SELECT customer_id, SUM(amount), COUNT(*)
+                FROM orders
+                GROUP BY customer_id
+            """)
+        logging.info("Пересчёт customer_order_stats завершён")
+
+    @staticmethod
+    async def _apply_customer_stats(conn: asyncpg.Connection, totals: Dict[int, Decimal],
+                                    counts: Dict[int, int]) -> None:
         """
-        Вставка нескольких заказов одним запросом.
-        orders - список словарей с ключами: customer_id, order_date, amount
+        Добавляет к customer_order_stats суммы и количества вставленных заказов.
+        Клиенты обновляются в порядке id, чтобы параллельные вставки не ловили взаимоблокировку.
         """
-        async with self._db.connection() as conn:
-            logging.info(f"Выполняется множественная вставка {len(orders)} заказов")
-            values = [(o["customer_id"], o["order_date"], o["amount"]) for o in orders]
-            await conn.executemany("""
-                INSERT INTO orders (customer_id, order_date, amount)
-                VALUES ($1, $2, $3)
-            """, values)
-            logging.info("Множественная вставка завершена")
+        customer_ids = sorted(totals)
+        await conn.execute("""
+            INSERT INTO customer_order_stats AS s (customer_id, total_amount, orders_count)
+            SELECT * FROM unnest($1::int[], $2::numeric[], $3::bigint[])
+            ON CONFLICT (customer_id) DO UPDATE
+                SET total_amount = s.total_amount + EXCLUDED.total_amount,
+                    orders_count = s.orders_count + EXCLUDED.orders_count
+        """, customer_ids, [totals[c] for c in customer_ids], [counts[c] for c in customer_ids])
@@ -0,0 +1,55 @@
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.services.csv_loader import EmployeeCSVLoader
+
+ROW_COUNTS = (10_000, 1_000_000, 10_000_000)
+POSITIONS = ("Разработчик", "Аналитик", "Тестировщик", "Менеджер проектов", "Дизайнер")
+
+
+def generate_csv(path: Path, rows: int) -> None:
+    """Генерирует CSV-файл сотрудников с заданным числом строк"""
+    rnd = random.Random(rows)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("name,position,salary\n")
+        for i in range(rows):
+            f.write(f"Сотрудник {i},{rnd.choice(POSITIONS)},{rnd.randint(20000, 300000)}.{rnd.randint(0, 99):02d}\n")
+
+
+async def measure_dict_reader(loader: EmployeeCSVLoader, path: Path) -> float:
+    """Текущий путь: csv.DictReader + Employee + Decimal на каждую строку"""
+    started = time.perf_counter()
+    async for _ in loader.load_employees_from_csv(path):
+        pass
+    return time.perf_counter() - started
+
+
+async def measure_columnar(loader: EmployeeCSVLoader, path: Path) -> float:
+    """Колоночный путь: батч разбирается в три колонки, зарплаты — целые копейки"""
+    started = time.perf_counter()
+    async for _ in loader.load_employee_columns_from_csv(path):
+        pass
+    return time.perf_counter() - started
+
+
+async def main(row_counts):
+    loader = EmployeeCSVLoader(batch_size=10_000)
+    print(f"{'строк':>12} | {'DictReader, с':>14} | {'колонки, с':>11} | {'ускорение':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in row_counts:
+            path = Path(tmp) / f"employees_{rows}.csv"
+            generate_csv(path, rows)
+            dict_reader = await measure_dict_reader(loader, path)
+            columnar = await measure_columnar(loader, path)
+            print(f"{rows:>12} | {dict_reader:>14.2f} | {columnar:>11.2f} | {dict_reader / columnar:>8.1f}x")
+            path.unlink()
+
+
+if __name__ == "__main__":
+    # Количество строк можно передать аргументами: python bench_csv_parser.py 10000 100000
+    counts = tuple(int(arg) for arg in sys.argv[1:]) or ROW_COUNTS
+    asyncio.run(main(counts))
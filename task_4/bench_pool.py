@@ -0,0 +1,51 @@
+import asyncio
+import random
+import sys
+
+from dbcore.bench import benchmark_pools
+from dbcore.config import DatabaseConfig
+from dbcore.connector import DatabaseConnection
+from src.database.base_table import Base, EXTENSIONS
+from src.database.employee_repository import EmployeeRepository
+
+CONCURRENCY = 64
+DURATION = 10.0
+SEARCH_TERMS = ("ив разраб", "ольга архит", "аналит")
+
+
+def employee_requests(db: DatabaseConnection, max_id: int):
+    """Смешанная нагрузка чтения: по id, первая страница курсора и полнотекстовый поиск"""
+    # Без кеша: меряем пул и БД, а не попадания в TTLCache
+    repo = EmployeeRepository(db)
+
+    async def request(rnd: random.Random) -> None:
+        choice = rnd.random()
+        if choice < 0.6:
+            await repo.get_employee_by_id(rnd.randint(1, max_id))
+        elif choice < 0.9:
+            await repo.get_employees_by_cursor(per_page=50)
+        else:
+            await repo.search_employees(rnd.choice(SEARCH_TERMS))
+
+    return request
+
+
+async def main(config: DatabaseConfig, concurrency: int, duration: float):
+    db = DatabaseConnection(config, metadata=Base.metadata, extensions=EXTENSIONS)
+    await db.connect()
+    try:
+        max_id = max(await EmployeeRepository(db).count_employees(EmployeeRepository.COUNT_ESTIMATE), 1)
+    finally:
+        await db.close()
+
+    await benchmark_pools(config, lambda pool_db: employee_requests(pool_db, max_id), concurrency, duration)
+
+
+if __name__ == "__main__":
+    # Нагрузочный тест только читает csv_employees; данные можно залить bench_search.py.
+    # Число клиентов и длительность можно передать аргументами: python bench_pool.py 128 30
+    # Подключение задаётся переменными окружения DB_HOST, DB_PORT, DB_USER, DB_PASSWORD и DB_NAME
+    config = DatabaseConfig.from_env()
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else CONCURRENCY
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else DURATION
+    asyncio.run(main(config, concurrency, duration))
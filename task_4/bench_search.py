@@ -0,0 +1,83 @@
+import asyncio
+import random
+import statistics
+import sys
+import time
+from decimal import Decimal
+
+from dbcore.config import DatabaseConfig
+from dbcore.bulk import copy_records
+from dbcore.connector import DatabaseConnection
+from src.database.base_table import Base, EXTENSIONS
+from src.database.employee_repository import EmployeeRepository
+from src.database.employee_table import Employee
+
+ROWS = 5_000_000
+REPEATS = 5
+FIRST_NAMES = ("Иван", "Пётр", "Мария", "Анна", "Сергей", "Ольга", "Алексей", "Елена", "Дмитрий", "Наталья")
+LAST_NAMES = ("Иванов", "Петров", "Смирнов", "Кузнецов", "Орлов", "Соколов", "Попов", "Лебедев", "Новиков")
+POSITIONS = ("Разработчик", "Аналитик", "Тестировщик", "Менеджер проектов", "Дизайнер", "Архитектор")
+NAME_TERMS = ("петров", "мария", "орлов 4")
+POSITION_TERMS = ("аналит", "менеджер")
+FTS_TERMS = ("ив разраб", "ольга архит")
+
+# Запрос до появления индексов: lower(col) LIKE '%x%' не может использовать индекс
+OLD_SEARCH_SQL = f"SELECT * FROM {Employee.__tablename__} WHERE lower({{column}}) LIKE $1 ORDER BY id"
+
+
+async def fill_table(db: DatabaseConnection, rows: int) -> None:
+    """Дополняет таблицу сотрудников синтетическими строками до rows записей"""
+    async with db.connection() as conn:
+        existing = await conn.fetchval(f"SELECT count(*) FROM {Employee.__tablename__}")
+    rnd = random.Random(rows)
+    records = (
+        (f"{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)} {i}", rnd.choice(POSITIONS),
+         Decimal(rnd.randint(2_000_000, 30_000_000)) / 100)
+        for i in range(existing, rows)
+    )
+    await copy_records(db, Employee.__tablename__, ["name", "position", "salary"], records)
+    async with db.connection() as conn:
+        await conn.execute(f"ANALYZE {Employee.__tablename__}")
+
+
+async def median_ms(call, repeats: int = REPEATS) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def main(config: DatabaseConfig, rows: int):
+    db = DatabaseConnection(config, metadata=Base.metadata, extensions=EXTENSIONS)
+    await db.connect()
+    try:
+        repo = EmployeeRepository(db)
+        await fill_table(db, rows)
+
+        async def old_search(column: str, term: str):
+            async with db.connection() as conn:
+                return await conn.fetch(OLD_SEARCH_SQL.format(column=column), f"%{term}%")
+
+        print(f"Строк в таблице: {rows}, медиана из {REPEATS} запусков\n")
+        print(f"{'запрос':<28} | {'LIKE, мс':>10} | {'индекс, мс':>10}")
+        for column, terms, indexed in (("name", NAME_TERMS, repo.find_employees_by_name),
+                                       ("position", POSITION_TERMS, repo.find_employees_by_position)):
+            for term in terms:
+                old = await median_ms(lambda: old_search(column, term))
+                new = await median_ms(lambda: indexed(term))
+                print(f"{column + ': ' + term:<28} | {old:>10.1f} | {new:>10.1f}")
+        for term in FTS_TERMS:
+            new = await median_ms(lambda: repo.search_employees(term))
+            print(f"{'полнотекстовый: ' + term:<28} | {'-':>10} | {new:>10.1f}")
+    finally:
+        await db.close()
+
+
+if __name__ == "__main__":
+    # Внимание: скрипт дописывает синтетических сотрудников в таблицу csv_employees.
+    # Количество строк можно передать аргументом: python bench_search.py 1000000
+    # Подключение задаётся переменными окружения DB_HOST, DB_PORT, DB_USER, DB_PASSWORD и DB_NAME
+    config = DatabaseConfig.from_env()
+    asyncio.run(main(config, int(sys.argv[1]) if len(sys.argv) > 1 else ROWS))
@@ -1,13 +1,17 @@
 import asyncio
-from src.config_model import DatabaseConfig
-from src.database.connector import DatabaseConnection
+from dbcore.config import DatabaseConfig, metrics_enabled
+from dbcore.cache import TTLCache
+from dbcore.connector import DatabaseConnection
+from src.database.base_table import Base, EXTENSIONS
 from src.database.employee_repository import EmployeeRepository
+from src.database.import_ledger_repository import ImportLedgerRepository
 from src.services.csv_loader import EmployeeCSVLoader
 from src.services.employee_service import EmployeeService
+from src.services.import_pipeline import CSVImportPipeline
 from src.menu import Menu
 from pathlib import Path
 import logging
-from src.setup_logger import configure
+from dbcore.setup_logger import configure, get_method_stats
 
 BASE_DIR = Path(__file__).resolve().parent
 CSV_FOLDER = BASE_DIR / "csv_folder"
@@ -24,18 +28,24 @@ async def main(config):
     Args:
         config (DatabaseConfig): Конфигурация подключения к базе данных.
     """
-    db = DatabaseConnection(config)
+    db = DatabaseConnection(config, metadata=Base.metadata, extensions=EXTENSIONS)
     try:
         await db.connect()
     except Exception as e:
         raise e
     try:
-        repo = EmployeeRepository(db)
+        repo = EmployeeRepository(db, TTLCache(max_entries=10_000, ttl=60.0))
         loader = EmployeeCSVLoader()
-        service = EmployeeService(repo, loader)
+        pipeline = CSVImportPipeline(repo, loader, ledger=ImportLedgerRepository(db))
+        service = EmployeeService(repo, loader, pipeline)
 
         menu = Menu(service, CSV_FOLDER, CSV_READED_FOLDER)
         await menu.run()
+        logging.info(str(repo.cache.stats()))
+        for stats in get_method_stats()[:10]:
+            logging.info(str(stats))
+        if db.metrics is not None:
+            logging.info(str(db.metrics.snapshot()))
     finally:
         await db.close()
 
@@ -47,6 +57,8 @@ if __name__ == "__main__":
         port=5432,
         user="postgres",
         password="AV123",
-        database="employees"
+        database="employees",
+        # DB_METRICS=1 - собирать метрики запросов и пула и вывести их в конце
+        metrics=metrics_enabled()
     )
     asyncio.run(main(config))
@@ -0,0 +1,6 @@
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
+
+# Расширения PostgreSQL, которые нужны индексам таблиц (триграммный поиск)
+EXTENSIONS = ("pg_trgm",)
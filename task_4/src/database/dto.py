@@ -0,0 +1,32 @@
+from array import array
+from dataclasses import dataclass
+from typing import List, Optional
+
+from src.database.employee_table import Employee
+
+
+@dataclass(frozen=True)
+class EmployeeColumnsDTO:
+    """Батч сотрудников в колоночном виде: зарплаты хранятся в копейках (целые числа)"""
+    names: List[str]
+    positions: List[str]
+    salary_cents: array
+
+    def __len__(self):
+        return len(self.names)
+
+
+@dataclass(frozen=True)
+class ImportCheckpointDTO:
+    """Контрольная точка батча: смещения в файле до и после батча"""
+    file_hash: str
+    start_offset: int
+    end_offset: int
+
+
+@dataclass(frozen=True)
+class EmployeePageDTO:
+    """Страница сотрудников с непрозрачными курсорами на соседние страницы"""
+    employees: List[Employee]
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
@@ -1,23 +1,85 @@
-from typing import List, Optional
+import base64
+import re
+from decimal import Decimal
+from typing import AsyncIterable, Iterable, List, Optional, Tuple
 from sqlalchemy.future import select
-from sqlalchemy import delete, func
-from src.database.employee_table import Employee
-from src.database.connector import DatabaseConnection
-from src.setup_logger import decorate_all_methods
+from sqlalchemy import delete, func, insert, literal_column, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database.dto import EmployeeColumnsDTO, EmployeePageDTO, ImportCheckpointDTO
+from src.database.employee_table import Employee, SEARCH_VECTOR_SQL
+from src.database.import_ledger_table import CSVImportBatch
+from dbcore.base_repository import BaseRepository
+from dbcore.bulk import bulk_update_statement
+from dbcore.cache import TTLCache
+from dbcore.connector import DatabaseConnection
+from dbcore.setup_logger import decorate_all_methods
+
+POSITIONS_KEY = ("employee_positions",)
+
+CURSOR_NEXT = "n"
+CURSOR_PREV = "p"
+
+
+def encode_cursor(direction: str, emp_id: int) -> str:
+    """
+    Кодирует курсор страницы: направление и граничный id.
+
+    Args:
+        direction: CURSOR_NEXT (записи после id) или CURSOR_PREV (записи до id).
+        emp_id: граничный идентификатор сотрудника.
+
+    Returns:
+        Непрозрачная строка курсора.
+    """
+    return base64.urlsafe_b64encode(f"{direction}:{emp_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """
+    Декодирует курсор, полученный из encode_cursor.
+
+    Raises:
+        ValueError: если курсор повреждён.
+    """
+    try:
+        direction, emp_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        if direction not in (CURSOR_NEXT, CURSOR_PREV):
+            raise ValueError(direction)
+        return direction, int(emp_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Неверный курсор страницы: {cursor!r}") from e
+
+
+def _like_pattern(value: str) -> str:
+    """Строит шаблон ILIKE для поиска подстроки, экранируя спецсимволы %, _ и \\ (ESCAPE по умолчанию)."""
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _prefix_tsquery(value: str) -> str:
+    """Строит tsquery вида 'слово1:* & слово2:*' для поиска по префиксам слов."""
+    return " & ".join(f"{word}:*" for word in re.findall(r"\w+", value.lower()))
 
 
 @decorate_all_methods
-class EmployeeRepository:
+class EmployeeRepository(BaseRepository):
     """Репозиторий для работы с сущностью Employee."""
 
-    def __init__(self, db: DatabaseConnection):
+    COUNT_EXACT = "exact"
+    COUNT_ESTIMATE = "estimate"
+    ESTIMATE_MIN_ROWS = 100_000
+
+    def __init__(self, db: DatabaseConnection, cache: Optional[TTLCache] = None):
         """
         Инициализация репозитория.
 
         Args:
             db: объект DatabaseConnection, предоставляет метод session().
+            cache: read-through кеш сотрудников по id и списка должностей. None — без кеша.
+                Записи через репозиторий сбрасывают затронутые ключи.
         """
-        self.db = db
+        super().__init__(db, cache)
 
     async def insert_employees(self, employees: List[Employee]) -> None:
         """
@@ -33,7 +95,104 @@ class EmployeeRepository:
         """
         async with self.db.session() as session:
             session.add_all(employees)
-            await session.commit()
+        self._invalidate(positions=True)
+
+    async def insert_employee_rows(self, rows: List[dict], checkpoint: Optional[ImportCheckpointDTO] = None) -> int:
+        """
+        Вставить сотрудников из словарей одним многострочным INSERT.
+
+        ORM-объекты не создаются, поэтому метод быстрее insert_employees на больших батчах.
+
+        Args:
+            rows: список словарей с ключами name, position, salary.
+            checkpoint: контрольная точка журнала загрузки, батч записывается в журнал в той же транзакции.
+
+        Returns:
+            Количество вставленных строк; 0, если батч уже записан в журнал.
+        """
+        async with self.db.session() as session:
+            if checkpoint and not await self._record_batch(session, checkpoint, len(rows)):
+                return 0
+            await session.execute(insert(Employee), rows)
+        self._invalidate(positions=True)
+        return len(rows)
+
+    async def insert_employee_columns(self, columns: EmployeeColumnsDTO,
+                                      checkpoint: Optional[ImportCheckpointDTO] = None) -> int:
+        """
+        Вставить батч сотрудников, переданный колонками, одним INSERT ... SELECT FROM unnest.
+
+        Колонки уходят в PostgreSQL тремя массивами, поэтому текст запроса не зависит
+        от размера батча и подготовленный запрос переиспользуется.
+
+        Args:
+            columns: колонки name, position и зарплаты в копейках.
+            checkpoint: контрольная точка журнала загрузки, батч записывается в журнал в той же транзакции.
+
+        Returns:
+            Количество вставленных строк; 0, если батч уже записан в журнал.
+        """
+        stmt = text(f"""
+            INSERT INTO {Employee.__tablename__} (name, position, salary)
+            SELECT name, position, salary_cents::numeric / 100
+            FROM unnest(CAST(:names AS text[]), CAST(:positions AS text[]), CAST(:salary_cents AS bigint[]))
+                AS t(name, position, salary_cents)
+        """)
+        async with self.db.session() as session:
+            if checkpoint and not await self._record_batch(session, checkpoint, len(columns)):
+                return 0
+            await session.execute(stmt, {
+                "names": columns.names,
+                "positions": columns.positions,
+                "salary_cents": columns.salary_cents,
+            })
+        self._invalidate(positions=True)
+        return len(columns)
+
+    async def _record_batch(self, session: AsyncSession, checkpoint: ImportCheckpointDTO, rows: int) -> bool:
+        """
+        Записать батч в журнал загрузки внутри текущей транзакции.
+
+        Батч регистрируется по началу своего диапазона, поэтому батчи одного файла могут
+        коммититься в любом порядке, а повторно тот же батч записать нельзя.
+
+        Returns:
+            False, если батч уже записан (например, файл с тем же содержимым загрузил
+            другой процесс): строки батча вставлять не нужно.
+        """
+        stmt = (
+            pg_insert(CSVImportBatch)
+            .values(file_hash=checkpoint.file_hash, start_offset=checkpoint.start_offset,
+                    end_offset=checkpoint.end_offset, rows=rows)
+            .on_conflict_do_nothing(index_elements=[CSVImportBatch.file_hash, CSVImportBatch.start_offset])
+        )
+        result = await session.execute(stmt)
+        return result.rowcount == 1
+
+    async def copy_employees_from_csv(self, columns: List[str], source: AsyncIterable[bytes]) -> int:
+        """
+        Загрузить сотрудников потоком CSV-байтов через COPY ... FROM STDIN.
+
+        ORM-объекты не создаются: байты передаются в PostgreSQL как есть,
+        вся загрузка выполняется в одной транзакции.
+
+        Args:
+            columns: порядок колонок в CSV (подмножество name, position, salary).
+            source: асинхронный итератор байтов CSV без строки заголовка.
+
+        Returns:
+            Количество загруженных строк.
+        """
+        async with self.db.connection() as conn:
+            async with conn.transaction():
+                status = await conn.copy_to_table(
+                    Employee.__tablename__,
+                    source=source,
+                    columns=columns,
+                    format="csv",
+                )
+        self._invalidate(positions=True)
+        return int(status.split()[-1])
 
     async def get_employees_page(self, page: int, per_page: int = 10) -> List[Employee]:
         """
@@ -57,6 +216,51 @@ class EmployeeRepository:
             result = await session.execute(stmt)
             return result.scalars().all()
 
+    async def get_employees_by_cursor(self, cursor: Optional[str] = None, per_page: int = 10) -> EmployeePageDTO:
+        """
+        Получить страницу сотрудников по курсору (keyset-пагинация по id).
+
+        В отличие от get_employees_page не использует OFFSET, поэтому скорость
+        не зависит от глубины страницы: запрос идёт по индексу первичного ключа.
+
+        Args:
+            cursor: курсор из предыдущей страницы (next_cursor/prev_cursor). None — первая страница.
+            per_page: количество записей на страницу.
+
+        Returns:
+            EmployeePageDTO со списком сотрудников и курсорами соседних страниц.
+
+        Raises:
+            ValueError: если курсор повреждён.
+        """
+        direction, boundary = decode_cursor(cursor) if cursor else (CURSOR_NEXT, None)
+        stmt = select(Employee)
+        if direction == CURSOR_NEXT:
+            if boundary is not None:
+                stmt = stmt.where(Employee.id > boundary)
+            stmt = stmt.order_by(Employee.id)
+        else:
+            stmt = stmt.where(Employee.id < boundary).order_by(Employee.id.desc())
+        stmt = stmt.limit(per_page + 1)
+
+        async with self.db.session() as session:
+            result = await session.execute(stmt)
+            employees = list(result.scalars().all())
+
+        has_more = len(employees) > per_page
+        employees = employees[:per_page]
+        if direction == CURSOR_NEXT:
+            has_next, has_prev = has_more, boundary is not None
+        else:
+            employees.reverse()
+            has_next, has_prev = True, has_more
+
+        return EmployeePageDTO(
+            employees=employees,
+            next_cursor=encode_cursor(CURSOR_NEXT, employees[-1].id) if employees and has_next else None,
+            prev_cursor=encode_cursor(CURSOR_PREV, employees[0].id) if employees and has_prev else None,
+        )
+
     async def get_employee_by_id(self, emp_id: int) -> Optional[Employee]:
         """
         Получить сотрудника по ID.
@@ -67,6 +271,9 @@ class EmployeeRepository:
         Returns:
             Объект Employee при найденном сотруднике, иначе None.
         """
+        return await self._cached(("employee", emp_id), lambda: self._load_employee(emp_id))
+
+    async def _load_employee(self, emp_id: int) -> Optional[Employee]:
         stmt = select(Employee).where(Employee.id == emp_id)
         async with self.db.session() as session:
             result = await session.execute(stmt)
@@ -76,6 +283,8 @@ class EmployeeRepository:
         """
         Поиск сотрудников по имени (частичное совпадение, регистр игнорируется).
 
+        Использует ILIKE по триграммному GIN-индексу ix_csv_employees_name_trgm.
+
         Args:
             name: строка для поиска в имени (может быть частью имени).
 
@@ -84,7 +293,7 @@ class EmployeeRepository:
         """
         stmt = (
             select(Employee)
-            .where(func.lower(Employee.name).like(f"%{name.lower()}%"))
+            .where(Employee.name.ilike(_like_pattern(name)))
             .order_by(Employee.id)
         )
         async with self.db.session() as session:
@@ -95,6 +304,8 @@ class EmployeeRepository:
         """
         Поиск сотрудников по должности (частичное совпадение, регистр игнорируется).
 
+        Использует ILIKE по триграммному GIN-индексу ix_csv_employees_position_trgm.
+
         Args:
             position: строка для поиска в поле position (может быть частью названия должности).
 
@@ -103,13 +314,42 @@ class EmployeeRepository:
         """
         stmt = (
             select(Employee)
-            .where(func.lower(Employee.position).like(f"%{position.lower()}%"))
+            .where(Employee.position.ilike(_like_pattern(position)))
             .order_by(Employee.id)
         )
         async with self.db.session() as session:
             result = await session.execute(stmt)
             return result.scalars().all()
 
+    async def search_employees(self, query: str, limit: int = 50) -> List[Employee]:
+        """
+        Полнотекстовый поиск по имени и должности с ранжированием.
+
+        Каждое слово запроса ищется как префикс ("ив разраб" найдёт "Иван ... Разработчик"),
+        запрос идёт по GIN-индексу ix_csv_employees_search.
+
+        Args:
+            query: слова для поиска.
+            limit: максимальное количество результатов.
+
+        Returns:
+            Список Employee, отсортированный по убыванию релевантности.
+        """
+        tsquery = _prefix_tsquery(query)
+        if not tsquery:
+            return []
+        vector = literal_column(SEARCH_VECTOR_SQL)
+        ts_query = func.to_tsquery(literal_column("'simple'"), tsquery)
+        stmt = (
+            select(Employee)
+            .where(vector.op("@@")(ts_query))
+            .order_by(func.ts_rank(vector, ts_query).desc(), Employee.id)
+            .limit(limit)
+        )
+        async with self.db.session() as session:
+            result = await session.execute(stmt)
+            return result.scalars().all()
+
     async def get_all_positions(self) -> List[str]:
         """
         Получить список всех уникальных должностей.
@@ -117,21 +357,36 @@ class EmployeeRepository:
         Returns:
             Отсортированный список уникальных значений поля position (строки).
         """
+        return await self._cached(POSITIONS_KEY, self._load_positions)
+
+    async def _load_positions(self) -> List[str]:
         stmt = select(Employee.position).distinct().order_by(Employee.position)
         async with self.db.session() as session:
             result = await session.execute(stmt)
             return [row[0] for row in result.all()]
 
-    async def count_employees(self) -> int:
+    async def count_employees(self, strategy: str = COUNT_EXACT) -> int:
         """
         Подсчитать общее количество сотрудников в таблице.
 
+        Args:
+            strategy: COUNT_EXACT — точный COUNT(*) (полный проход по таблице);
+                COUNT_ESTIMATE — оценка из pg_class.reltuples без чтения таблицы.
+                Если оценки нет или она меньше ESTIMATE_MIN_ROWS, выполняется точный подсчёт.
+
         Returns:
             Общее количество записей (int).
         """
-        stmt = select(func.count()).select_from(Employee)
         async with self.db.session() as session:
-            result = await session.execute(stmt)
+            if strategy == self.COUNT_ESTIMATE:
+                result = await session.execute(
+                    text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                    {"table": Employee.__tablename__},
+                )
+                estimate = result.scalar_one_or_none()
+                if estimate is not None and estimate >= self.ESTIMATE_MIN_ROWS:
+                    return estimate
+            result = await session.execute(select(func.count()).select_from(Employee))
             return result.scalar_one()
 
     async def insert_employee(self, employee: Employee) -> None:
@@ -143,7 +398,7 @@ class EmployeeRepository:
         """
         async with self.db.session() as session:
             session.add(employee)
-            await session.commit()
+        self._invalidate(positions=True)
 
     async def update_employee(self, employee: Employee):
         """
@@ -153,11 +408,67 @@ class EmployeeRepository:
             employee: объект Employee с заполненным id и новыми значениями.
 
         Notes:
-            Используется session.merge(), затем commit().
+            Используется session.merge(); фиксирует изменения session() или db.transaction().
+        """
+        try:
+            async with self.db.session() as session:
+                await session.merge(employee)
+        finally:
+            self._invalidate(employee.id, positions=True)
+
+    async def update_employee_salary(self, emp_id: int, salary: Decimal) -> Optional[Employee]:
+        """
+        Обновить зарплату сотрудника одним запросом UPDATE ... RETURNING.
+
+        Чтение и запись идут одним атомарным запросом в одной транзакции,
+        поэтому нет лишнего SELECT и гонки «прочитал — перезаписал».
+
+        Args:
+            emp_id: идентификатор сотрудника.
+            salary: новая зарплата.
+
+        Returns:
+            Обновлённый Employee или None, если сотрудник не найден.
+        """
+        stmt = (
+            update(Employee)
+            .where(Employee.id == emp_id)
+            .values(salary=salary)
+            .returning(Employee)
+        )
+        async with self.db.session() as session:
+            result = await session.execute(stmt)
+            employee = result.scalars().first()
+        self._invalidate(emp_id)
+        if employee:
+            self._remember(("employee", emp_id), employee)
+        return employee
+
+    async def update_salaries(self, salaries: Iterable[Tuple[int, Decimal]]) -> int:
+        """
+        Массово обновить зарплаты одним запросом UPDATE ... FROM unnest.
+
+        Пары (id, зарплата) передаются двумя массивами, поэтому тысячи изменений
+        (например, расчёт зарплат) применяются за один запрос и одну транзакцию.
+
+        Args:
+            salaries: пары (id сотрудника, новая зарплата).
+
+        Returns:
+            Количество обновлённых сотрудников (несуществующие id пропускаются).
         """
+        ids: List[int] = []
+        values: List[Decimal] = []
+        for emp_id, salary in salaries:
+            ids.append(emp_id)
+            values.append(Decimal(salary))
+        if not ids:
+            return 0
+        stmt = bulk_update_statement(Employee.__tablename__, ("id", "integer"), (("salary", "numeric"),))
         async with self.db.session() as session:
-            await session.merge(employee)
-            await session.commit()
+            result = await session.execute(stmt, {"id": ids, "salary": values})
+        self._invalidate(*ids)
+        return result.rowcount
 
     async def delete_employee(self, emp_id: int):
         """
@@ -168,7 +479,10 @@ class EmployeeRepository:
         """
         async with self.db.session() as session:
             await session.execute(delete(Employee).where(Employee.id == emp_id))
-            await session.commit()
+        self._invalidate(emp_id, positions=True)
 
-    def __repr__(self):
-        return f"<EmployeeRepository(db={self.db!r})>"
+    def _invalidate(self, *emp_ids: int, positions: bool = False) -> None:
+        """Сбрасывает в кеше сотрудников с указанными id и, при positions=True, список должностей."""
+        self._forget(*(("employee", emp_id) for emp_id in emp_ids))
+        if positions:
+            self._forget(POSITIONS_KEY)
@@ -1,15 +1,25 @@
 from decimal import Decimal
 
-from sqlalchemy import Column, Integer, String, Numeric
+from sqlalchemy import Column, Index, Integer, String, Numeric, text
 from sqlalchemy.orm import mapped_column, Mapped
 
-from src.database.connector import Base
+from src.database.base_table import Base
+
+# Выражение полнотекстового поиска; в запросах должно совпадать с выражением индекса
+SEARCH_VECTOR_SQL = "to_tsvector('simple', name || ' ' || position)"
 
 
 class Employee(Base):
     """Таблица с сотрудниками"""
 
     __tablename__ = "csv_employees"
+    __table_args__ = (
+        Index("ix_csv_employees_name_trgm", "name",
+              postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_csv_employees_position_trgm", "position",
+              postgresql_using="gin", postgresql_ops={"position": "gin_trgm_ops"}),
+        Index("ix_csv_employees_search", text(SEARCH_VECTOR_SQL), postgresql_using="gin"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String, nullable=False)
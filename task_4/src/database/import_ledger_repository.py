@@ -0,0 +1,120 @@
+from typing import Dict, Optional, Tuple
+from sqlalchemy import delete, func, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.future import select
+from dbcore.base_repository import BaseRepository
+from dbcore.connector import DatabaseConnection
+from src.database.import_ledger_table import CSVImport, CSVImportBatch
+from dbcore.setup_logger import decorate_all_methods
+
+
+@decorate_all_methods
+class ImportLedgerRepository(BaseRepository):
+    """Репозиторий журнала загрузки CSV-файлов."""
+
+    def __init__(self, db: DatabaseConnection):
+        """
+        Инициализация репозитория.
+
+        Args:
+            db: объект DatabaseConnection, предоставляет метод session().
+        """
+        super().__init__(db)
+
+    async def find_done(self, file_name: str, file_size: int, file_mtime_ns: int) -> Optional[CSVImport]:
+        """
+        Найти завершённую загрузку по дешёвому ключу файла, не читая его содержимое.
+
+        Args:
+            file_name: имя файла.
+            file_size: размер файла в байтах.
+            file_mtime_ns: время изменения файла в наносекундах.
+
+        Returns:
+            Запись CSVImport со статусом done или None, если файл по этому ключу не загружался.
+        """
+        stmt = (
+            select(CSVImport)
+            .where(CSVImport.file_name == file_name,
+                   CSVImport.file_size == file_size,
+                   CSVImport.file_mtime_ns == file_mtime_ns,
+                   CSVImport.status == CSVImport.STATUS_DONE)
+            .limit(1)
+        )
+        async with self.db.session() as session:
+            result = await session.execute(stmt)
+            return result.scalars().first()
+
+    async def start_import(self, file_hash: str, file_name: str, file_size: Optional[int] = None,
+                           file_mtime_ns: Optional[int] = None) -> CSVImport:
+        """
+        Зарегистрировать загрузку файла или вернуть уже существующую запись журнала.
+
+        Имя, размер и время изменения обновляются у существующей записи, чтобы
+        следующий запуск узнал тот же файл по дешёвому ключу.
+
+        Args:
+            file_hash: SHA-256 содержимого файла.
+            file_name: имя файла (для информации, ключом служит хеш).
+            file_size: размер файла в байтах.
+            file_mtime_ns: время изменения файла в наносекундах.
+
+        Returns:
+            Запись CSVImport с текущей контрольной точкой и статусом.
+        """
+        stmt = insert(CSVImport).values(
+            file_hash=file_hash, file_name=file_name, file_size=file_size, file_mtime_ns=file_mtime_ns,
+            byte_offset=0, rows_committed=0, status=CSVImport.STATUS_IN_PROGRESS
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CSVImport.file_hash],
+            set_={"file_name": stmt.excluded.file_name,
+                  "file_size": stmt.excluded.file_size,
+                  "file_mtime_ns": stmt.excluded.file_mtime_ns},
+        )
+        async with self.db.session() as session:
+            await session.execute(stmt)
+            result = await session.execute(select(CSVImport).where(CSVImport.file_hash == file_hash))
+            entry = result.scalars().one()
+            return entry
+
+    async def committed_batches(self, file_hash: str) -> Dict[int, Tuple[int, int]]:
+        """
+        Батчи незавершённой загрузки, закоммиченные после контрольной точки CSVImport.
+
+        Args:
+            file_hash: SHA-256 содержимого файла.
+
+        Returns:
+            Словарь: начало батча -> (конец батча, число строк).
+        """
+        stmt = (
+            select(CSVImportBatch.start_offset, CSVImportBatch.end_offset, CSVImportBatch.rows)
+            .where(CSVImportBatch.file_hash == file_hash)
+        )
+        async with self.db.session() as session:
+            result = await session.execute(stmt)
+            return {start: (end, rows) for start, end, rows in result}
+
+    async def finish_import(self, file_hash: str) -> None:
+        """
+        Отметить загрузку файла как завершённую.
+
+        Записанные батчи сворачиваются в контрольную точку CSVImport и удаляются.
+
+        Args:
+            file_hash: SHA-256 содержимого файла.
+        """
+        of_file = CSVImportBatch.file_hash == file_hash
+        last_offset = select(func.max(CSVImportBatch.end_offset)).where(of_file).scalar_subquery()
+        batch_rows = select(func.coalesce(func.sum(CSVImportBatch.rows), 0)).where(of_file).scalar_subquery()
+        stmt = (
+            update(CSVImport)
+            .where(CSVImport.file_hash == file_hash)
+            .values(status=CSVImport.STATUS_DONE,
+                    byte_offset=func.greatest(CSVImport.byte_offset, func.coalesce(last_offset, 0)),
+                    rows_committed=CSVImport.rows_committed + batch_rows)
+        )
+        async with self.db.session() as session:
+            await session.execute(stmt)
+            await session.execute(delete(CSVImportBatch).where(of_file))
@@ -0,0 +1,57 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, String, func
+from sqlalchemy.orm import mapped_column, Mapped
+
+from src.database.base_table import Base
+
+
+class CSVImport(Base):
+    """
+    Журнал загрузки CSV-файлов: хеш содержимого, контрольная точка и статус.
+
+    Имя, размер и время изменения файла - дешёвый ключ, по которому уже загруженный
+    файл узнаётся без чтения содержимого.
+    """
+
+    __tablename__ = "csv_imports"
+    __table_args__ = (
+        Index("ix_csv_imports_file_key", "file_name", "file_size", "file_mtime_ns"),
+    )
+
+    STATUS_IN_PROGRESS = "in_progress"
+    STATUS_DONE = "done"
+
+    file_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    file_name: Mapped[str] = mapped_column(String, nullable=False)
+    file_size: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    file_mtime_ns: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    byte_offset: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    rows_committed: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default=STATUS_IN_PROGRESS)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
+    def __str__(self):
+        return (f"{self.file_name} ({self.file_hash[:12]}): {self.status}, "
+                f"строк: {self.rows_committed}, смещение: {self.byte_offset}")
+
+
+class CSVImportBatch(Base):
+    """
+    Закоммиченный батч незавершённой загрузки: диапазон байтов файла и число строк.
+
+    Строка пишется в транзакции батча, поэтому батчи одного файла могут коммититься
+    в любом порядке; при завершении загрузки они сворачиваются в CSVImport.
+    """
+
+    __tablename__ = "csv_import_batches"
+
+    file_hash: Mapped[str] = mapped_column(
+        String(64), ForeignKey("csv_imports.file_hash", ondelete="CASCADE"), primary_key=True
+    )
+    start_offset: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    end_offset: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    rows: Mapped[int] = mapped_column(BigInteger, nullable=False)
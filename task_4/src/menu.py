@@ -1,7 +1,7 @@
 import decimal
 from pathlib import Path
 
-from src.setup_logger import decorate_all_methods
+from dbcore.setup_logger import decorate_all_methods
 from src.services.employee_service import EmployeeService
 
 
@@ -41,9 +41,15 @@ class Menu:
             elif choice == "D":
                 await self.search_employee_by_name()
 
+            elif choice == "E":
+                await self.copy_csv()
+
             elif choice == "F":
                 await self.search_employee_by_position()
 
+            elif choice == "G":
+                await self.full_text_search()
+
             elif choice == "0":
                 print("Выход из программы.")
                 break
@@ -60,34 +66,61 @@ class Menu:
         print("B. Показать список сотрудников")
         print("C. Выбрать сотрудника по ID")
         print("D. Поиск сотрудника по имени")
+        print("E. Быстрая загрузка всех CSV из папки (COPY)")
         print("F. Поиск сотрудника по специальности")
+        print("G. Поиск по имени и специальности (по началу слов)")
         print("0. Выход")
 
     async def load_csv(self):
         """
         Загружает все CSV-файлы из папки в базу и перемещает их в папку прочитанных.
         """
-        await self.service.load_all_csv_from_folder(
+        stats = await self.service.load_all_csv_from_folder(
             source_folder=self.csv_folder,
             readed_folder=self.csv_readed_folder
         )
         print("CSV-файлы загружены в базу и перемещены.")
+        print(stats)
+
+    async def copy_csv(self):
+        """
+        Массово загружает все CSV-файлы из папки через COPY и выводит скорость загрузки.
+        """
+        stats = await self.service.copy_all_csv_from_folder(
+            source_folder=self.csv_folder,
+            readed_folder=self.csv_readed_folder
+        )
+        print(stats)
 
     async def list_employees(self):
         """
         Показывает постраничный список сотрудников и предоставляет дополнительные действия.
+
+        Переход на соседние страницы (N/P) идёт по курсору, ввод номера страницы — прямой переход.
         """
-        page = 1
+        page_number = None
         per_page = 10
+        page = await self.service.list_employees_by_cursor(per_page=per_page)
         while True:
-            await self.service.list_employees_page(page=page, per_page=per_page)
-            print("\nA. Выбрать сотрудника по ID")
+            print("\nN. Следующая страница")
+            print("P. Предыдущая страница")
+            print("A. Выбрать сотрудника по ID")
             print("B. Поиск сотрудника по имени")
             print("C. Поиск сотрудника по специальности")
             print("0. В меню")
             sub_choice = input("Введите страницу или действие: ").strip().upper()
 
-            if sub_choice == "A":
+            if sub_choice in ("N", "P"):
+                if page is None:
+                    page_number = max(1, page_number + (1 if sub_choice == "N" else -1))
+                    await self.service.list_employees_page(page=page_number, per_page=per_page)
+                    continue
+                cursor = page.next_cursor if sub_choice == "N" else page.prev_cursor
+                if cursor is None:
+                    print("Страница отсутствует.")
+                    continue
+                page = await self.service.list_employees_by_cursor(cursor, per_page)
+            elif sub_choice == "A":
                 await self.select_employee_by_id()
             elif sub_choice == "B":
                 await self.search_employee_by_name()
@@ -96,7 +129,8 @@ class Menu:
             elif sub_choice == "0":
                 break
             elif sub_choice.isdigit():
-                page = int(sub_choice)
+                page_number, _ = await self.service.list_employees_page(page=int(sub_choice), per_page=per_page)
+                page = None
             else:
                 print("Неверный выбор, попробуйте снова.")
 
@@ -149,10 +183,9 @@ class Menu:
             print("Неверный формат зарплаты. Попробуйте снова.")
             return
 
-        success = await self.service.update_employee_salary(emp_id, new_salary)
-        if success:
+        emp = await self.service.update_employee_salary(emp_id, new_salary)
+        if emp:
             print(f"Зарплата сотрудника с ID {emp_id} обновлена на {new_salary:.2f}.")
-            emp = await self.service.get_employee_by_id(emp_id)
             print(emp)
         else:
             print("Не удалось обновить зарплату.")
@@ -208,6 +241,19 @@ class Menu:
         else:
             print("Сотрудники не найдены.")
 
+    async def full_text_search(self):
+        """
+        Выполняет полнотекстовый поиск сотрудников по началу слов имени и должности.
+        """
+        query = input("Введите слова или их начало (например, «ив разраб»): ")
+        print()
+        results = await self.service.search_employees(query)
+        if results:
+            for emp in results:
+                print(emp)
+        else:
+            print("Сотрудники не найдены.")
+
     def __repr__(self):
         return (f"<Menu(service={self.service!r}, "
                 f"csv_folder={self.csv_folder!r}, "
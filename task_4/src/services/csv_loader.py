@@ -1,22 +1,298 @@
+import asyncio
 import csv
+import gzip
+import hashlib
+import io
+import mmap
+import os
+import re
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import AsyncGenerator, List
-from decimal import Decimal
+from typing import AsyncGenerator, BinaryIO, Iterator, List, Tuple, TypeVar
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from src.database.dto import EmployeeColumnsDTO
 from src.database.employee_table import Employee
-from src.setup_logger import decorate_all_methods
+from dbcore.setup_logger import decorate_all_methods
+
+T = TypeVar("T")
+
+_DONE = object()
+
+CENTS = Decimal("0.01")
+# Запись зарплаты, которую salary_to_cents разбирает без Decimal: 123, -12.5, .50
+_PLAIN_SALARY = re.compile(r"\s*([+-]?)(\d*)(?:\.(\d*))?\s*")
+
+
+def parse_employee_rows(columns: List[str], lines: List[str]) -> List[dict]:
+    """
+    Разбирает сырые строки CSV в словари для массовой вставки.
+
+    Функция верхнего уровня, чтобы её можно было выполнять в пуле процессов.
+
+    Args:
+        columns: порядок колонок в CSV.
+        lines: строки CSV без заголовка.
+
+    Returns:
+        Список словарей с ключами name, position, salary.
+
+    Raises:
+        ValueError: если зарплата пустая или не число (см. parse_salary).
+    """
+    name_idx, position_idx, salary_idx = (columns.index(column) for column in EmployeeCSVLoader.COLUMNS)
+    return [
+        {"name": row[name_idx], "position": row[position_idx], "salary": parse_salary(row[salary_idx])}
+        for row in csv.reader(lines)
+        if row
+    ]
+
+
+def parse_salary(value: str) -> Decimal:
+    """
+    Разбирает зарплату из CSV по грамматике Decimal.
+
+    Raises:
+        ValueError: если значение пустое, не число или не конечно (NaN, Infinity).
+    """
+    try:
+        salary = Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"Некорректная зарплата {value!r}") from None
+    if not salary.is_finite():
+        raise ValueError(f"Некорректная зарплата {value!r}")
+    return salary
+
+
+def salary_to_cents(value: str) -> int:
+    """
+    Переводит десятичную строку зарплаты в целое число копеек.
+
+    Простые записи (123, -12.5) разбираются без Decimal, остальные (1e5, 1_000) - через
+    parse_salary, поэтому принимается то же, что и в parse_employee_rows.
+    Дробная часть округляется до двух знаков половиной от нуля, как NUMERIC(15, 2).
+
+    Raises:
+        ValueError: если значение пустое, не число или не конечно.
+    """
+    match = _PLAIN_SALARY.fullmatch(value)
+    if match is None or not (match[2] or match[3]):
+        try:
+            return int(parse_salary(value).quantize(CENTS, ROUND_HALF_UP) * 100)
+        except InvalidOperation:
+            raise ValueError(f"Некорректная зарплата {value!r}") from None
+    sign, whole, frac = match[1], match[2], match[3] or ""
+    cents = int(whole or 0) * 100 + int((frac + "00")[:2])
+    if len(frac) > 2 and frac[2] >= "5":
+        cents += 1
+    return -cents if sign == "-" else cents
+
+
+def parse_employee_columns(columns: List[str], lines: List[str]) -> EmployeeColumnsDTO:
+    """
+    Разбирает сырые строки CSV сразу в колонки, без словаря и объекта на каждую строку.
+
+    Если в батче нет кавычек и в каждой строке ровно len(columns) - 1 запятых, строки
+    склеиваются и режутся по запятым одним split, а колонки берутся срезами;
+    иначе используется csv.reader. Функция верхнего уровня, чтобы её можно было
+    выполнять в пуле процессов.
+
+    Args:
+        columns: порядок колонок в CSV.
+        lines: строки CSV без заголовка.
+
+    Returns:
+        EmployeeColumnsDTO с именами, должностями и зарплатами в копейках.
+
+    Raises:
+        ValueError: если в строке не столько полей, сколько колонок в заголовке,
+            или зарплата пустая либо не число.
+    """
+    width = len(columns)
+    name_idx, position_idx, salary_idx = (columns.index(column) for column in EmployeeCSVLoader.COLUMNS)
+    text = "".join(lines)
+    fields = None
+    if '"' not in text:
+        records = [record for record in text.replace("\r\n", "\n").split("\n") if record]
+        # Проверяется каждая строка: лишнее поле в одной и недостающее в другой сдвинули бы все колонки
+        if all(record.count(",") == width - 1 for record in records):
+            fields = ",".join(records).split(",")
+    if fields is None:
+        fields = []
+        for row in csv.reader(lines):
+            if not row:
+                continue
+            if len(row) != width:
+                raise ValueError(f"Строка CSV {row!r}: полей {len(row)}, ожидалось {width}")
+            fields.extend(row)
+
+    return EmployeeColumnsDTO(
+        names=fields[name_idx::width],
+        positions=fields[position_idx::width],
+        salary_cents=array("q", map(salary_to_cents, fields[salary_idx::width])),
+    )
+
+
+def _open_binary(csv_file: Path, use_mmap: bool) -> BinaryIO:
+    """
+    Открывает CSV-файл на чтение байтов с учётом сжатия.
+
+    Файлы .gz и .zst распаковываются на лету, несжатые файлы при use_mmap
+    отображаются в память, так что в RAM находится только читаемый участок.
+    """
+    suffix = csv_file.suffix.lower()
+    if suffix == ".gz":
+        return gzip.open(csv_file, "rb")
+    if suffix == ".zst":
+        if zstandard is None:
+            raise RuntimeError("Для чтения .zst-файлов установите пакет zstandard")
+        reader = zstandard.ZstdDecompressor().stream_reader(open(csv_file, "rb"), closefd=True)
+        return io.BufferedReader(reader)
+
+    f = open(csv_file, "rb")
+    if use_mmap and os.fstat(f.fileno()).st_size > 0:
+        with f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return f
+
+
+def _iter_text_lines(stream: BinaryIO) -> Iterator[str]:
+    """Построчно декодирует бинарный поток в строки UTF-8 с сохранением переводов строк."""
+    for line in iter(stream.readline, b""):
+        yield line.decode("utf-8")
+
+
+def _read_header(csv_file: Path, use_mmap: bool) -> List[str]:
+    with _open_binary(csv_file, use_mmap) as stream:
+        return next(csv.reader(_iter_text_lines(stream)), [])
+
+
+def _read_employee_batches(csv_file: Path, use_mmap: bool, batch_size: int) -> Iterator[List[Employee]]:
+    with _open_binary(csv_file, use_mmap) as stream:
+        batch: List[Employee] = []
+        for row in csv.DictReader(_iter_text_lines(stream)):
+            batch.append(Employee(
+                name=row["name"],
+                position=row["position"],
+                salary=Decimal(row["salary"])
+            ))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _seek(stream: BinaryIO, offset: int) -> None:
+    """Переходит к смещению в распакованном потоке; несжимаемые к seek потоки дочитываются."""
+    seekable = getattr(stream, "seekable", None)
+    if seekable is None or seekable():
+        stream.seek(offset)
+        return
+    while offset > 0 and (chunk := stream.read(min(offset, 1024 * 1024))):
+        offset -= len(chunk)
+
+
+def _read_line_batches(csv_file: Path, use_mmap: bool, batch_size: int,
+                       start_offset: int = 0) -> Iterator[Tuple[List[str], int]]:
+    with _open_binary(csv_file, use_mmap) as stream:
+        if start_offset:
+            _seek(stream, start_offset)
+            offset = start_offset
+        else:
+            offset = len(stream.readline())
+        batch: List[str] = []
+        quotes = 0
+        for raw_line in iter(stream.readline, b""):
+            offset += len(raw_line)
+            line = raw_line.decode("utf-8")
+            batch.append(line)
+            quotes += line.count('"')
+            if len(batch) >= batch_size and quotes % 2 == 0:
+                yield batch, offset
+                batch = []
+                quotes = 0
+        if batch:
+            yield batch, offset
+
+
+def _read_column_batches(csv_file: Path, use_mmap: bool, batch_size: int) -> Iterator[EmployeeColumnsDTO]:
+    columns = [column.strip() for column in _read_header(csv_file, use_mmap)]
+    for lines, _ in _read_line_batches(csv_file, use_mmap, batch_size):
+        yield parse_employee_columns(columns, lines)
+
+
+def _hash_file(csv_file: Path) -> str:
+    digest = hashlib.sha256()
+    with open(csv_file, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_chunks(csv_file: Path, use_mmap: bool, chunk_size: int) -> Iterator[bytes]:
+    with _open_binary(csv_file, use_mmap) as stream:
+        stream.readline()
+        while chunk := stream.read(chunk_size):
+            yield chunk
+
+
+async def _iterate_in_thread(iterator: Iterator[T]) -> AsyncGenerator[T, None]:
+    """
+    Проходит синхронный итератор в отдельном потоке, не блокируя цикл событий.
+
+    Каждый шаг итератора (чтение и разбор целого батча) выполняется в выделенном
+    потоке; закрытие итератора ставится в тот же поток, поэтому файл закрывается
+    даже при досрочной остановке потребителя.
+    """
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="csv-reader")
+    try:
+        while (item := await loop.run_in_executor(executor, next, iterator, _DONE)) is not _DONE:
+            yield item
+    finally:
+        executor.submit(iterator.close)
+        executor.shutdown(wait=False)
 
 
 @decorate_all_methods
 class EmployeeCSVLoader:
-    def __init__(self, batch_size: int = 1000):
+    COLUMNS = ("name", "position", "salary")
+    PATTERNS = ("*.csv", "*.csv.gz", "*.csv.zst")
+
+    def __init__(self, batch_size: int = 1000, chunk_size: int = 1024 * 1024, use_mmap: bool = False):
         """
         Инициализация загрузчика CSV.
 
+        Чтение файла и разбор строк выполняются в отдельном потоке, цикл событий
+        получает уже готовые батчи. Поддерживаются несжатые, .gz и .zst (пакет zstandard) файлы.
+
         Args:
             batch_size: количество сотрудников в одном батче при загрузке.
+            chunk_size: размер куска в байтах при потоковом чтении файла для COPY.
+            use_mmap: читать несжатые файлы через mmap вместо буферизованного чтения.
         """
         self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.use_mmap = use_mmap
+
+    def list_csv_files(self, folder: Path) -> List[Path]:
+        """
+        Возвращает отсортированный список поддерживаемых CSV-файлов в папке.
+
+        Args:
+            folder: папка для поиска.
+
+        Returns:
+            Пути к файлам *.csv, *.csv.gz и *.csv.zst.
+        """
+        return sorted({path for pattern in self.PATTERNS for path in folder.glob(pattern)})
 
     async def load_employees_from_csv(self, csv_file: Path) -> AsyncGenerator[List[Employee], None]:
         """
@@ -28,21 +304,95 @@ class EmployeeCSVLoader:
         Returns:
             AsyncGenerator, выдающий списки Employee размером batch_size или меньше.
         """
-        batch: List[Employee] = []
-        with open(csv_file, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                employee = Employee(
-                    name=row["name"],
-                    position=row["position"],
-                    salary=Decimal(row["salary"])
-                )
-                batch.append(employee)
-                if len(batch) >= self.batch_size:
-                    yield batch
-                    batch = []
-            if batch:
-                yield batch
+        async for batch in _iterate_in_thread(_read_employee_batches(csv_file, self.use_mmap, self.batch_size)):
+            yield batch
+
+    async def load_employee_columns_from_csv(self, csv_file: Path) -> AsyncGenerator[EmployeeColumnsDTO, None]:
+        """
+        Асинхронно загружает сотрудников из CSV-файла батчами в колоночном виде.
+
+        Быстрый режим разбора: вместо Employee и Decimal на каждую строку батч
+        превращается в три колонки, зарплаты — целые копейки.
+
+        Args:
+            csv_file: путь к CSV-файлу с данными сотрудников.
+
+        Returns:
+            AsyncGenerator, выдающий EmployeeColumnsDTO размером около batch_size строк.
+        """
+        await self.read_csv_header(csv_file)
+        async for batch in _iterate_in_thread(_read_column_batches(csv_file, self.use_mmap, self.batch_size)):
+            yield batch
+
+    async def read_csv_header(self, csv_file: Path) -> List[str]:
+        """
+        Читает заголовок CSV-файла и проверяет набор колонок.
+
+        Args:
+            csv_file: путь к CSV-файлу с данными сотрудников.
+
+        Returns:
+            Список колонок в порядке их следования в файле.
+
+        Raises:
+            ValueError: если набор колонок не совпадает с name, position, salary.
+        """
+        header = await asyncio.to_thread(_read_header, csv_file, self.use_mmap)
+        columns = [column.strip() for column in header]
+        if sorted(columns) != sorted(self.COLUMNS):
+            raise ValueError(f"Неверный заголовок CSV в файле {csv_file.name}: {columns}")
+        return columns
+
+    async def read_raw_batches(self, csv_file: Path,
+                               start_offset: int = 0) -> AsyncGenerator[Tuple[List[str], int], None]:
+        """
+        Асинхронно отдаёт сырые строки CSV-файла батчами, пропуская заголовок.
+
+        Батч обрезается только на границе записи (чётное число кавычек),
+        поэтому поля с переносами строк не разрываются между батчами.
+        Вместе с батчем отдаётся смещение в байтах сразу после него, с которого
+        чтение можно продолжить после сбоя.
+
+        Args:
+            csv_file: путь к CSV-файлу с данными сотрудников.
+            start_offset: смещение в распакованных байтах, с которого начать чтение.
+                0 — начало файла (заголовок пропускается).
+
+        Returns:
+            AsyncGenerator, выдающий пары (строки батча, смещение после батча).
+        """
+        batches = _read_line_batches(csv_file, self.use_mmap, self.batch_size, start_offset)
+        async for batch in _iterate_in_thread(batches):
+            yield batch
+
+    async def hash_file(self, csv_file: Path) -> str:
+        """
+        Считает SHA-256 содержимого файла в отдельном потоке.
+
+        Args:
+            csv_file: путь к файлу.
+
+        Returns:
+            Хеш в шестнадцатеричном виде.
+        """
+        return await asyncio.to_thread(_hash_file, csv_file)
+
+    async def stream_csv_bytes(self, csv_file: Path) -> AsyncGenerator[bytes, None]:
+        """
+        Асинхронно отдаёт содержимое CSV-файла кусками байтов, пропуская заголовок.
+
+        Строки не разбираются, поэтому поток можно передать напрямую в COPY.
+        Сжатые файлы отдаются уже распакованными.
+
+        Args:
+            csv_file: путь к CSV-файлу с данными сотрудников.
+
+        Returns:
+            AsyncGenerator, выдающий куски файла размером chunk_size или меньше.
+        """
+        async for chunk in _iterate_in_thread(_read_chunks(csv_file, self.use_mmap, self.chunk_size)):
+            yield chunk
 
     def __repr__(self):
-        return f"<EmployeeCSVLoader(batch_size={self.batch_size})>"
+        return (f"<EmployeeCSVLoader(batch_size={self.batch_size}, "
+                f"chunk_size={self.chunk_size}, use_mmap={self.use_mmap})>")
@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ImportStatsDTO:
+    """Итоги загрузки CSV-файлов в базу"""
+    files: int
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (f"Загружено файлов: {self.files}, строк: {self.rows} "
+                f"за {self.seconds:.2f} с ({self.rows_per_second:.0f} строк/с)")
@@ -1,43 +1,118 @@
+from decimal import Decimal
 from pathlib import Path
 import shutil
-from typing import List, Tuple
+import time
+from typing import Iterable, List, Optional, Tuple
 
+from src.database.dto import EmployeePageDTO
+from src.services.dto import ImportStatsDTO
+from src.services.import_pipeline import CSVImportPipeline
 from src.services.table_formatter import TableFormatter
 from src.database.employee_table import Employee
 from src.services.csv_loader import EmployeeCSVLoader
 from src.database.employee_repository import EmployeeRepository
-from src.setup_logger import decorate_all_methods
+from dbcore.setup_logger import decorate_all_methods, Logger
+
+log = Logger(__name__)
 
 
 @decorate_all_methods
 class EmployeeService:
-    def __init__(self, repository: EmployeeRepository, csv_loader: EmployeeCSVLoader):
+    def __init__(self, repository: EmployeeRepository, csv_loader: EmployeeCSVLoader,
+                 import_pipeline: Optional[CSVImportPipeline] = None,
+                 count_strategy: str = EmployeeRepository.COUNT_ESTIMATE, count_ttl: float = 30.0):
         """
         Инициализация сервиса сотрудников.
 
         Args:
             repository: репозиторий для работы с БД сотрудников.
             csv_loader: загрузчик сотрудников из CSV-файлов.
+            import_pipeline: конвейер загрузки CSV. По умолчанию создаётся с настройками по умолчанию.
+            count_strategy: стратегия подсчёта сотрудников (см. EmployeeRepository.count_employees).
+            count_ttl: сколько секунд кешировать общее количество сотрудников между страницами.
         """
         self.repository = repository
         self.csv_loader = csv_loader
+        self.import_pipeline = import_pipeline or CSVImportPipeline(repository, csv_loader)
+        self.count_strategy = count_strategy
+        self.count_ttl = count_ttl
+        self._total_cache: Optional[Tuple[int, float]] = None
+
+    async def count_employees(self) -> int:
+        """
+        Общее количество сотрудников с кешированием на count_ttl секунд.
+
+        Кеш сбрасывается при загрузке CSV и удалении сотрудников через сервис.
+
+        Returns:
+            Количество сотрудников (точное или оценка, в зависимости от count_strategy).
+        """
+        now = time.monotonic()
+        if self._total_cache and now - self._total_cache[1] < self.count_ttl:
+            return self._total_cache[0]
+        total = await self.repository.count_employees(self.count_strategy)
+        self._total_cache = (total, now)
+        return total
+
+    def invalidate_count(self) -> None:
+        """Сбрасывает закешированное количество сотрудников."""
+        self._total_cache = None
 
-    async def load_all_csv_from_folder(self, source_folder: Path, readed_folder: Path) -> None:
+    async def load_all_csv_from_folder(self, source_folder: Path, readed_folder: Path) -> ImportStatsDTO:
         """
         Загружает всех сотрудников из CSV-файлов в папке и перемещает файлы в папку прочитанных.
 
+        Файлы обрабатываются конвейером CSVImportPipeline: несколько файлов разбираются
+        параллельно, батчи пишутся в БД несколькими сессиями.
+
         Args:
             source_folder: папка с CSV-файлами для загрузки.
             readed_folder: папка для перемещения обработанных CSV-файлов.
+
+        Returns:
+            ImportStatsDTO с количеством файлов, строк и скоростью загрузки.
         """
         source_folder.mkdir(exist_ok=True)
         readed_folder.mkdir(exist_ok=True)
 
-        for csv_file in source_folder.glob("*.csv"):
-            async for batch in self.csv_loader.load_employees_from_csv(csv_file):
-                await self.repository.insert_employees(batch)
+        try:
+            return await self.import_pipeline.run(source_folder, readed_folder)
+        finally:
+            self.invalidate_count()
+
+    async def copy_all_csv_from_folder(self, source_folder: Path, readed_folder: Path) -> ImportStatsDTO:
+        """
+        Массовая загрузка CSV-файлов из папки через COPY ... FROM STDIN.
+
+        В отличие от load_all_csv_from_folder не создаёт ORM-объекты: байты файла
+        передаются в PostgreSQL напрямую, каждый файл загружается одной транзакцией.
+
+        Args:
+            source_folder: папка с CSV-файлами для загрузки.
+            readed_folder: папка для перемещения обработанных CSV-файлов.
+
+        Returns:
+            ImportStatsDTO с количеством файлов, строк и скоростью загрузки.
+        """
+        source_folder.mkdir(exist_ok=True)
+        readed_folder.mkdir(exist_ok=True)
+
+        files = 0
+        rows = 0
+        started = time.perf_counter()
+        for csv_file in self.csv_loader.list_csv_files(source_folder):
+            columns = await self.csv_loader.read_csv_header(csv_file)
+            rows += await self.repository.copy_employees_from_csv(
+                columns, self.csv_loader.stream_csv_bytes(csv_file)
+            )
+            files += 1
             shutil.move(str(csv_file), readed_folder / csv_file.name)
 
+        self.invalidate_count()
+        stats = ImportStatsDTO(files=files, rows=rows, seconds=time.perf_counter() - started)
+        log.info(str(stats))
+        return stats
+
     async def list_employees_page(self, page: int = 1, per_page: int = 10) -> tuple[int, int]:
         """
         Выводит таблицу сотрудников по странице с пагинацией.
@@ -50,11 +125,35 @@ class EmployeeService:
             Кортеж (текущая_страница, общее_число_страниц).
         """
         employees = await self.repository.get_employees_page(page, per_page)
-        total_employees = await self.repository.count_employees()
+        total_employees = await self.count_employees()
         total_pages = (total_employees + per_page - 1) // per_page if per_page else 1
         if page > total_pages:
             print(f"Страница {page} отсутствует. Всего страниц: {total_pages}")
             return total_pages, total_pages
+
+        await self._print_employees(employees)
+        print(f"\nВсего страниц: {page}/{total_pages}")
+
+        return page, total_pages
+
+    async def list_employees_by_cursor(self, cursor: Optional[str] = None, per_page: int = 10) -> EmployeePageDTO:
+        """
+        Выводит таблицу сотрудников для страницы, заданной курсором (keyset-пагинация).
+
+        Args:
+            cursor: курсор соседней страницы из предыдущего вызова. None — первая страница.
+            per_page: количество сотрудников на странице.
+
+        Returns:
+            EmployeePageDTO с курсорами на следующую и предыдущую страницы.
+        """
+        page = await self.repository.get_employees_by_cursor(cursor, per_page)
+        await self._print_employees(page.employees)
+        print(f"\nВсего сотрудников: {await self.count_employees()}")
+        return page
+
+    async def _print_employees(self, employees: List[Employee]) -> None:
+        """Печатает сотрудников таблицей."""
         headers = ["id", "Name", "Position", "Salary"]
         rows = [
             [str(emp.id), emp.name, emp.position, f"{emp.salary:.2f}"]
@@ -63,9 +162,6 @@ class EmployeeService:
 
         formatter = TableFormatter(headers, rows)
         await formatter.print_table()
-        print(f"\nВсего страниц: {page}/{total_pages}")
-
-        return page, total_pages
 
     async def get_employee_by_id(self, emp_id: int) -> Employee | None:
         """
@@ -91,6 +187,18 @@ class EmployeeService:
         """
         return await self.repository.find_employees_by_name(name.lower())
 
+    async def search_employees(self, query: str) -> List[Employee]:
+        """
+        Полнотекстовый поиск сотрудников по имени и должности (по префиксам слов, с ранжированием).
+
+        Args:
+            query: слова для поиска.
+
+        Returns:
+            Список сотрудников, самые релевантные первыми.
+        """
+        return await self.repository.search_employees(query)
+
     async def search_employees_by_position(self, position: str) -> Tuple:
         """
         Поиск сотрудников по позиции (частичное совпадение, без учёта регистра) и получение всех позиций.
@@ -105,33 +213,50 @@ class EmployeeService:
         positions_list = await self.repository.get_all_positions()
         return employees, positions_list
 
-    async def update_employee_salary(self, emp_id: int, new_salary: float) -> bool:
+    async def update_employee_salary(self, emp_id: int, new_salary: Decimal) -> Optional[Employee]:
         """
-        Обновление зарплаты сотрудника.
+        Обновление зарплаты сотрудника одним запросом.
+
+        Обновление и запись свежей строки в кеш идут одной единицей работы:
+        кеш обновляется только после коммита.
 
         Args:
             emp_id: ID сотрудника.
             new_salary: новая зарплата.
 
         Returns:
-            True, если сотрудник найден и обновлён, иначе False.
+            Обновлённый Employee, если сотрудник найден, иначе None.
+        """
+        async with self.repository.db.transaction():
+            return await self.repository.update_employee_salary(emp_id, new_salary)
+
+    async def update_salaries(self, salaries: Iterable[Tuple[int, Decimal]]) -> int:
+        """
+        Массовое обновление зарплат (например, при расчёте зарплат) одним запросом.
+
+        Args:
+            salaries: пары (ID сотрудника, новая зарплата).
+
+        Returns:
+            Количество обновлённых сотрудников.
         """
-        employee = await self.repository.get_employee_by_id(emp_id)
-        if employee:
-            employee.salary = new_salary
-            await self.repository.update_employee(employee)
-            return True
-        return False
+        return await self.repository.update_salaries(salaries)
 
     async def delete_employee(self, emp_id: int) -> None:
         """
         Удаление сотрудника по ID.
 
+        Удаление выполняется единицей работы: кеш сотрудника, позиций и количества
+        сбрасывается только после коммита.
+
         Args:
             emp_id: ID сотрудника.
         """
-        await self.repository.delete_employee(emp_id)
+        async with self.repository.db.transaction():
+            await self.repository.delete_employee(emp_id)
+            self.repository.db.after_commit(self.invalidate_count)
 
     def __repr__(self):
         return (f"<EmployeeService(repository={repr(self.repository)}, "
-                f"csv_loader={repr(self.csv_loader)})>")
+                f"csv_loader={repr(self.csv_loader)}, "
+                f"import_pipeline={repr(self.import_pipeline)})>")
@@ -0,0 +1,218 @@
+import asyncio
+import shutil
+import time
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.database.dto import ImportCheckpointDTO
+from src.database.employee_repository import EmployeeRepository
+from src.database.import_ledger_repository import ImportLedgerRepository
+from src.database.import_ledger_table import CSVImport
+from src.services.csv_loader import EmployeeCSVLoader, parse_employee_columns, parse_employee_rows
+from src.services.dto import ImportStatsDTO
+from dbcore.setup_logger import decorate_all_methods, Logger
+
+log = Logger(__name__)
+
+
+@decorate_all_methods
+class CSVImportPipeline:
+    """
+    Конвейерная загрузка CSV-файлов: разбор и запись в БД идут параллельно.
+
+    Продюсеры (по одному на файл, не больше max_files_in_flight одновременно) читают
+    сырые батчи строк, разбирают их в пуле и кладут в ограниченную очередь.
+    workers потребителей забирают батчи из очереди и пишут их каждый в своей сессии.
+    В колоночном режиме батчи разбираются в EmployeeColumnsDTO и вставляются через unnest.
+    Файл переносится в папку прочитанных только после коммита всех его батчей.
+
+    С журналом загрузки (ledger) каждый батч коммитится вместе со своей записью в журнале,
+    поэтому батчи одного файла пишутся параллельно и в любом порядке. Уже загруженные
+    файлы пропускаются по имени, размеру и времени изменения (хеш считается только при
+    промахе), а прерванные дочитываются: закоммиченные батчи при повторе пропускаются.
+    Файлы с одинаковым содержимым загружаются один раз, остальные копии пропускаются.
+    """
+
+    def __init__(self, repository: EmployeeRepository, csv_loader: EmployeeCSVLoader,
+                 workers: int = 4, max_files_in_flight: int = 2, queue_size: int = 16,
+                 processes: Optional[int] = None, columnar: bool = False,
+                 ledger: Optional[ImportLedgerRepository] = None):
+        """
+        Инициализация конвейера.
+
+        Args:
+            repository: репозиторий для работы с БД сотрудников.
+            csv_loader: загрузчик сотрудников из CSV-файлов.
+            workers: количество параллельных задач записи в БД.
+            max_files_in_flight: сколько файлов одновременно читается и разбирается.
+            queue_size: ёмкость очереди батчей; при заполнении продюсеры ждут.
+            processes: размер пула процессов для разбора CSV. None — разбор в пуле потоков.
+            columnar: использовать колоночный разбор без объектов на каждую строку.
+            ledger: журнал загрузки для идемпотентной и возобновляемой загрузки. None — без журнала.
+        """
+        self.repository = repository
+        self.csv_loader = csv_loader
+        self.workers = workers
+        self.max_files_in_flight = max_files_in_flight
+        self.queue_size = queue_size
+        self.processes = processes
+        self.columnar = columnar
+        self.ledger = ledger
+
+    async def run(self, source_folder: Path, readed_folder: Path) -> ImportStatsDTO:
+        """
+        Загружает все CSV-файлы из папки и перемещает их в папку прочитанных.
+
+        Args:
+            source_folder: папка с CSV-файлами для загрузки.
+            readed_folder: папка для перемещения обработанных CSV-файлов.
+
+        Returns:
+            ImportStatsDTO с количеством файлов, строк и скоростью загрузки.
+        """
+        csv_files = self.csv_loader.list_csv_files(source_folder)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        files_semaphore = asyncio.Semaphore(self.max_files_in_flight)
+        hash_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        executor = ProcessPoolExecutor(max_workers=self.processes) if self.processes else None
+
+        started = time.perf_counter()
+        consumers = [asyncio.create_task(self._consume(queue)) for _ in range(self.workers)]
+        producers = [
+            asyncio.create_task(self._produce(csv_file, readed_folder, queue, files_semaphore, executor, hash_locks))
+            for csv_file in csv_files
+        ]
+        try:
+            results = await asyncio.gather(*producers)
+        finally:
+            for task in producers + consumers:
+                task.cancel()
+            await asyncio.gather(*producers, *consumers, return_exceptions=True)
+            if executor:
+                executor.shutdown(cancel_futures=True)
+
+        # Пропущенные по журналу файлы (None) в число загруженных не входят
+        loaded = [rows for rows in results if rows is not None]
+        stats = ImportStatsDTO(files=len(loaded), rows=sum(loaded), seconds=time.perf_counter() - started)
+        log.info(str(stats))
+        return stats
+
+    async def _produce(self, csv_file: Path, readed_folder: Path, queue: asyncio.Queue,
+                       files_semaphore: asyncio.Semaphore, executor: Optional[Executor],
+                       hash_locks: Dict[str, asyncio.Lock]) -> Optional[int]:
+        """
+        Проверяет файл по журналу загрузки и загружает его, если он ещё не загружен.
+
+        Файлы с одинаковым содержимым делят одну запись журнала, поэтому загружаются
+        по очереди: следующий ждёт предыдущий и пропускается как уже загруженный.
+
+        Returns:
+            Количество загруженных из файла строк или None, если файл уже был загружен и пропущен.
+        """
+        async with files_semaphore:
+            if not self.ledger:
+                return await self._import_file(csv_file, readed_folder, queue, executor)
+            # Хеш читает весь файл, поэтому сначала ищем загрузку по имени, размеру и mtime
+            stat = csv_file.stat()
+            if await self.ledger.find_done(csv_file.name, stat.st_size, stat.st_mtime_ns):
+                self._skip(csv_file, readed_folder)
+                return None
+            file_hash = await self.csv_loader.hash_file(csv_file)
+            async with hash_locks[file_hash]:
+                entry = await self.ledger.start_import(file_hash, csv_file.name, stat.st_size, stat.st_mtime_ns)
+                if entry.status == CSVImport.STATUS_DONE:
+                    self._skip(csv_file, readed_folder)
+                    return None
+                return await self._import_file(csv_file, readed_folder, queue, executor, entry)
+
+    def _skip(self, csv_file: Path, readed_folder: Path) -> None:
+        """Переносит уже загруженный файл в папку прочитанных."""
+        shutil.move(str(csv_file), readed_folder / csv_file.name)
+        log.info(f"Файл {csv_file.name} уже загружен ранее, пропускаем")
+
+    async def _import_file(self, csv_file: Path, readed_folder: Path, queue: asyncio.Queue,
+                           executor: Optional[Executor], entry: Optional[CSVImport] = None) -> int:
+        """
+        Разбирает один файл, отправляет его батчи в очередь и ждёт их коммита.
+
+        С записью журнала entry загрузка продолжается после закоммиченных батчей.
+
+        Returns:
+            Количество загруженных из файла строк.
+        """
+        loop = asyncio.get_running_loop()
+        parse = parse_employee_columns if self.columnar else parse_employee_rows
+        file_hash = entry.file_hash if entry else None
+        offset = 0
+        committed_batches: Dict[int, Tuple[int, int]] = {}
+        if entry:
+            offset = entry.byte_offset
+            committed_batches = await self.ledger.committed_batches(file_hash)
+            # Непрерывный префикс закоммиченных батчей читать заново не нужно
+            while offset in committed_batches:
+                offset, _ = committed_batches.pop(offset)
+            if offset:
+                log.info(f"Файл {csv_file.name}: продолжаем с байта {offset}")
+
+        columns = await self.csv_loader.read_csv_header(csv_file)
+        pending: List[asyncio.Future] = []
+        async for lines, end_offset in self.csv_loader.read_raw_batches(csv_file, offset):
+            start_offset, offset = offset, end_offset
+            if self._already_committed(committed_batches, start_offset, end_offset):
+                continue
+            rows = await loop.run_in_executor(executor, parse, columns, lines)
+            checkpoint = ImportCheckpointDTO(file_hash, start_offset, end_offset) if file_hash else None
+            committed = loop.create_future()
+            await queue.put((rows, checkpoint, committed))
+            pending.append(committed)
+
+        # Ждём все батчи, даже если какой-то упал: иначе исключения остальных так и не будут получены
+        counts = await asyncio.gather(*pending, return_exceptions=True)
+        errors = [count for count in counts if isinstance(count, BaseException)]
+        if errors:
+            raise errors[0]
+        if file_hash:
+            await self.ledger.finish_import(file_hash)
+        shutil.move(str(csv_file), readed_folder / csv_file.name)
+        log.info(f"Файл {csv_file.name} загружен: {sum(counts)} строк")
+        return sum(counts)
+
+    def _already_committed(self, committed_batches: Dict[int, Tuple[int, int]],
+                           start_offset: int, end_offset: int) -> bool:
+        """
+        Проверяет, был ли батч закоммичен в прерванном запуске.
+
+        Raises:
+            RuntimeError: если границы батча не совпадают с журналом (изменился размер батча).
+        """
+        committed = committed_batches.get(start_offset)
+        if committed and committed[0] == end_offset:
+            return True
+        if committed or any(start_offset < start < end_offset for start in committed_batches):
+            raise RuntimeError(f"Батч {start_offset}-{end_offset} пересекается с закоммиченным батчем журнала; "
+                               f"размер батча должен совпадать с прерванной загрузкой")
+        return False
+
+    async def _consume(self, queue: asyncio.Queue) -> None:
+        """Забирает батчи из очереди и записывает их в БД до отмены задачи."""
+        insert = self.repository.insert_employee_columns if self.columnar else self.repository.insert_employee_rows
+        while True:
+            rows, checkpoint, committed = await queue.get()
+            try:
+                count = await insert(rows, checkpoint)
+            except Exception as e:
+                if not committed.done():
+                    committed.set_exception(e)
+            else:
+                if not committed.done():
+                    committed.set_result(count)
+            finally:
+                queue.task_done()
+
+    def __repr__(self):
+        return (f"<CSVImportPipeline(workers={self.workers}, "
+                f"max_files_in_flight={self.max_files_in_flight}, "
+                f"queue_size={self.queue_size}, processes={self.processes}, "
+                f"columnar={self.columnar}, ledger={self.ledger!r})>")
@@ -1,6 +1,6 @@
 from typing import List
 
-from src.setup_logger import decorate_all_methods
+from dbcore.setup_logger import decorate_all_methods
 
 
 @decorate_all_methods
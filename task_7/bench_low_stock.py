@@ -0,0 +1,74 @@
+import asyncio
+import random
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+
+from dbcore.config import DatabaseConfig
+from dbcore.connector import DatabaseConnection
+from src.database.base_table import Base
+from src.database.product_repository import ProductRepository
+
+PRODUCTS = 2_000_000
+LOW_STOCK_SHARE = 0.05
+THRESHOLD = 10
+
+
+def generate_products(count: int):
+    """Синтетический каталог: около LOW_STOCK_SHARE продуктов с остатком меньше THRESHOLD"""
+    rnd = random.Random(count)
+    for i in range(count):
+        low = rnd.random() < LOW_STOCK_SHARE
+        yield {
+            "name": f"SKU-{i:08d}",
+            "price": Decimal(rnd.randint(100, 100_000)) / 100,
+            "quantity": rnd.randint(0, THRESHOLD - 1) if low else rnd.randint(THRESHOLD, 1000),
+        }
+
+
+async def materialized(repo: ProductRepository) -> int:
+    return len(await repo.get_low_stock_products(THRESHOLD))
+
+
+async def streamed(repo: ProductRepository) -> int:
+    count = 0
+    async for chunk in repo.stream_low_stock_products(THRESHOLD, chunk_size=1000):
+        count += len(chunk)
+    return count
+
+
+async def measure(call, repo: ProductRepository):
+    """Возвращает (строк, секунд, пик памяти в МБ); память меряется отдельным прогоном"""
+    started = time.perf_counter()
+    rows = await call(repo)
+    seconds = time.perf_counter() - started
+
+    tracemalloc.start()
+    await call(repo)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, seconds, peak / 1024 / 1024
+
+
+async def main(config: DatabaseConfig, products: int):
+    db = DatabaseConnection(config, metadata=Base.metadata)
+    await db.connect()
+    try:
+        repo = ProductRepository(db)
+        print(await repo.upsert_products(generate_products(products)))
+        print(f"\n{'метод':<28} | {'строк':>8} | {'время, с':>8} | {'пик памяти, МБ':>14}")
+        for title, call in (("get_low_stock_products", materialized),
+                            ("stream_low_stock_products", streamed)):
+            rows, seconds, peak = await measure(call, repo)
+            print(f"{title:<28} | {rows:>8} | {seconds:>8.2f} | {peak:>14.1f}")
+    finally:
+        await db.close()
+
+
+if __name__ == "__main__":
+    # Внимание: скрипт добавляет в таблицу products синтетические SKU-*.
+    # Размер каталога можно передать аргументом: python bench_low_stock.py 500000
+    # Подключение задаётся переменными окружения DB_HOST, DB_PORT, DB_USER, DB_PASSWORD и DB_NAME
+    config = DatabaseConfig.from_env()
+    asyncio.run(main(config, int(sys.argv[1]) if len(sys.argv) > 1 else PRODUCTS))
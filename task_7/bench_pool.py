@@ -0,0 +1,48 @@
+import asyncio
+import random
+import sys
+
+from dbcore.bench import benchmark_pools
+from dbcore.config import DatabaseConfig
+from dbcore.connector import DatabaseConnection
+from src.database.base_table import Base
+from src.database.product_repository import ProductRepository
+
+CONCURRENCY = 64
+DURATION = 10.0
+
+
+def product_requests(db: DatabaseConnection, products: int):
+    """Смешанная нагрузка чтения: продукт по имени и малые остатки по частичному индексу"""
+    # Без кеша: меряем пул и БД, а не попадания в TTLCache
+    repo = ProductRepository(db)
+
+    async def request(rnd: random.Random) -> None:
+        if rnd.random() < 0.9:
+            await repo.get_product_by_name(f"SKU-{rnd.randrange(products):08d}")
+        else:
+            await repo.get_low_stock_products(threshold=10)
+
+    return request
+
+
+async def main(config: DatabaseConfig, concurrency: int, duration: float):
+    db = DatabaseConnection(config, metadata=Base.metadata)
+    await db.connect()
+    try:
+        async with db.connection() as conn:
+            products = max(await conn.fetchval("SELECT count(*) FROM products"), 1)
+    finally:
+        await db.close()
+
+    await benchmark_pools(config, lambda pool_db: product_requests(pool_db, products), concurrency, duration)
+
+
+if __name__ == "__main__":
+    # Нагрузочный тест только читает products; каталог SKU-* можно залить bench_low_stock.py.
+    # Число клиентов и длительность можно передать аргументами: python bench_pool.py 128 30
+    # Подключение задаётся переменными окружения DB_HOST, DB_PORT, DB_USER, DB_PASSWORD и DB_NAME
+    config = DatabaseConfig.from_env()
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else CONCURRENCY
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else DURATION
+    asyncio.run(main(config, concurrency, duration))
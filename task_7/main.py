@@ -2,22 +2,24 @@ import asyncio
 from decimal import Decimal
 import logging
 
-from src.config_model import DatabaseConfig
-from src.database.connector import DatabaseConnection
+from dbcore.config import DatabaseConfig, metrics_enabled
+from dbcore.cache import TTLCache
+from dbcore.connector import DatabaseConnection
+from src.database.base_table import Base
 from src.database.product_repository import ProductRepository
-from src.setup_logger import configure
+from dbcore.setup_logger import configure, get_method_stats
 
 
 async def main(config, products_data):
-    db = DatabaseConnection(config)
+    db = DatabaseConnection(config, metadata=Base.metadata)
     await db.connect()
 
-    repo = ProductRepository(db)
+    repo = ProductRepository(db, TTLCache(max_entries=10_000, ttl=60.0))
 
     try:
-        # Добавляем 10 тестовых продуктов
-        await repo.insert_products(products_data)
-        print("✅ Добавлено 10 тестовых продуктов")
+        # Добавляем 10 тестовых продуктов (существующие обновляются)
+        result = await repo.upsert_products(products_data)
+        print(f"✅ {result}")
 
         # Получаем товары с остатком < 10
         low_stock = await repo.get_low_stock_products(threshold=10)
@@ -25,12 +27,18 @@ async def main(config, products_data):
         for p in low_stock:
             print(f"{p.id}: {p.name} — {p.price} ₽, {p.quantity} шт.")
 
-        # Обновляем цену одного из продуктов
-        await repo.update_price_by_name("Apple", Decimal("19.99"))
-        updated_product = await repo.get_product_by_name("Apple")
+        # Обновляем цену одного из продуктов и читаем его в той же транзакции
+        async with db.transaction():
+            await repo.update_price_by_name("Apple", Decimal("19.99"))
+            updated_product = await repo.get_product_by_name("Apple")
         print("\n💰 После обновления цены:")
         print(
             f"{updated_product.id}: {updated_product.name} — {updated_product.price} ₽, {updated_product.quantity} шт.")
+        print(f"\n{repo.cache.stats()}")
+        for stats in get_method_stats()[:10]:
+            logging.info(str(stats))
+        if db.metrics is not None:
+            logging.info(str(db.metrics.snapshot()))
     finally:
         await db.close()
 
@@ -43,7 +51,9 @@ if __name__ == "__main__":
         port=5432,
         user="postgres",
         password="AV123",
-        database="employees"
+        database="employees",
+        # DB_METRICS=1 - собирать метрики запросов и пула и вывести их в конце
+        metrics=metrics_enabled()
     )
 
     products_data = [
@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from typing import List
+
+
+@dataclass(frozen=True)
+class BulkUpdateResultDTO:
+    """Результат массового обновления продуктов по имени"""
+    matched: int
+    unknown_names: List[str]
+
+    def __str__(self):
+        return f"Обновлено продуктов: {self.matched}, не найдено: {len(self.unknown_names)}"
+
+
+@dataclass(frozen=True)
+class UpsertResultDTO:
+    """Результат потоковой загрузки продуктов с upsert"""
+    inserted: int
+    updated: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return (self.inserted + self.updated) / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (f"Добавлено продуктов: {self.inserted}, обновлено: {self.updated} "
+                f"за {self.seconds:.2f} с ({self.rows_per_second:.0f} строк/с)")
@@ -1,25 +1,39 @@
-from typing import List, Optional
+import time
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, List, Mapping, Optional, Union
 from decimal import Decimal
 from sqlalchemy.future import select
-from sqlalchemy import delete, update
-from src.database.connector import DatabaseConnection
-from src.setup_logger import class_logger
-from src.database.product_table import Product
+from sqlalchemy import MetaData, Row, bindparam, delete, update
+from dbcore.base_repository import BaseRepository
+from dbcore.bulk import bulk_update_statement, chunked, upsert_statement
+from dbcore.cache import TTLCache
+from dbcore.connector import DatabaseConnection
+from src.database.dto import BulkUpdateResultDTO, UpsertResultDTO
+from dbcore.setup_logger import decorate_all_methods, Logger
+from src.database.product_table import Product, low_stock_index
 
+log = Logger(__name__)
 
-@class_logger
-class ProductRepository:
+
+def _threshold(threshold: int):
+    """Порог остатка литералом в тексте запроса: с параметром частичный индекс не подходит."""
+    return bindparam("threshold", int(threshold), literal_execute=True)
+
+
+@decorate_all_methods
+class ProductRepository(BaseRepository):
     """Репозиторий для работы с сущностью Product."""
 
-    def __init__(self, db: DatabaseConnection):
+    def __init__(self, db: DatabaseConnection, cache: Optional[TTLCache] = None):
         """
         Инициализация репозитория.
 
         Args:
             db (DatabaseConnection): Объект подключения к базе данных, 
                 предоставляющий метод session().
+            cache (TTLCache, optional): read-through кеш продуктов по ID и имени. None — без кеша.
+                Записи через репозиторий сбрасывают затронутые ключи.
         """
-        self.db = db
+        super().__init__(db, cache)
 
     async def insert_products(self, products_data: List[dict]) -> None:
         """
@@ -35,7 +49,49 @@ class ProductRepository:
         async with self.db.session() as session:
             products = [Product(**data) for data in products_data]
             session.add_all(products)
-            await session.commit()
+
+    async def upsert_products(self, products: Union[Iterable[dict], AsyncIterable[dict]],
+                              chunk_size: int = 10_000) -> UpsertResultDTO:
+        """
+        Потоково загружает продукты с обновлением существующих по имени (upsert).
+
+        Поток режется на пачки по chunk_size; каждая пачка применяется одним запросом
+        INSERT ... SELECT FROM unnest ... ON CONFLICT (name) DO UPDATE и коммитится отдельно
+        (внутри db.transaction() - вместе со всей единицей работы), поэтому поток
+        не материализуется целиком, а существующее имя не валит всю пачку.
+        Внутри пачки повторяющиеся имена схлопываются, побеждает последнее значение.
+
+        Args:
+            products (Iterable[dict] | AsyncIterable[dict]): Поток словарей с ключами
+                name, price, quantity.
+            chunk_size (int, optional): Размер пачки.
+
+        Returns:
+            UpsertResultDTO: Количество добавленных и обновлённых продуктов и скорость загрузки.
+        """
+        columns = (("name", "text"), ("price", "numeric"), ("quantity", "integer"))
+        stmt = upsert_statement(Product.__tablename__, columns, ("name",), count_inserted=True)
+        inserted = updated = 0
+        started = time.perf_counter()
+        try:
+            async for chunk in chunked(products, chunk_size):
+                unique: Dict[str, dict] = {item["name"]: item for item in chunk}
+                async with self.db.session() as session:
+                    result = await session.execute(stmt, {
+                        "name": list(unique),
+                        "price": [Decimal(item["price"]) for item in unique.values()],
+                        "quantity": [int(item["quantity"]) for item in unique.values()],
+                    })
+                    counts = result.one()
+                inserted += counts.inserted
+                updated += counts.updated
+        finally:
+            # Пачки до ошибки уже закоммичены, их продукты в кеше устарели
+            self._forget_all()
+
+        stats = UpsertResultDTO(inserted=inserted, updated=updated, seconds=time.perf_counter() - started)
+        log.info(str(stats))
+        return stats
 
     async def insert_product(self, product: Product) -> None:
         """
@@ -46,7 +102,6 @@ class ProductRepository:
         """
         async with self.db.session() as session:
             session.add(product)
-            await session.commit()
 
     async def get_product_by_id(self, prod_id: int) -> Optional[Product]:
         """
@@ -58,11 +113,32 @@ class ProductRepository:
         Returns:
             Optional[Product]: Объект Product или None.
         """
+        return await self._cached(("product_id", prod_id), lambda: self._load_product_by_id(prod_id))
+
+    async def _load_product_by_id(self, prod_id: int) -> Optional[Product]:
         stmt = select(Product).where(Product.id == prod_id)
         async with self.db.session() as session:
             result = await session.execute(stmt)
             return result.scalars().first()
 
+    async def get_product_by_name(self, name: str) -> Optional[Product]:
+        """
+        Получить продукт по имени.
+
+        Args:
+            name (str): Имя продукта.
+
+        Returns:
+            Optional[Product]: Объект Product или None.
+        """
+        return await self._cached(("product_name", name), lambda: self._load_product_by_name(name))
+
+    async def _load_product_by_name(self, name: str) -> Optional[Product]:
+        stmt = select(Product).where(Product.name == name)
+        async with self.db.session() as session:
+            result = await session.execute(stmt)
+            return result.scalars().first()
+
     async def get_all_products(self) -> List[Product]:
         """
         Получить все продукты.
@@ -79,16 +155,63 @@ class ProductRepository:
         """
         Получить список продуктов, у которых остаток меньше указанного порога.
 
+        Порог подставляется в запрос литералом, чтобы планировщик мог выбрать
+        частичный индекс ix_products_low_stock_<порог>.
+
         Args:
             threshold (int, optional): минимальный порог для фильтрации
         Returns:
             List[Product]: Список объектов Product.
         """
-        stmt = select(Product).where(Product.quantity < threshold)
+        stmt = select(Product).where(Product.quantity < _threshold(threshold))
         async with self.db.session() as session:
             result = await session.execute(stmt)
             return result.scalars().all()
 
+    async def stream_low_stock_products(self, threshold: int = 10,
+                                        chunk_size: int = 1000) -> AsyncIterator[List[Row]]:
+        """
+        Потоково отдаёт продукты с остатком меньше порога пачками лёгких строк.
+
+        Строки читаются серверным курсором по chunk_size штук, ORM-объекты
+        не создаются, поэтому память не зависит от числа подходящих продуктов.
+
+        Args:
+            threshold (int, optional): минимальный порог для фильтрации.
+            chunk_size (int, optional): количество строк в одной пачке.
+
+        Returns:
+            AsyncIterator[List[Row]]: Пачки строк с полями id, name, price, quantity.
+        """
+        stmt = (
+            select(Product.id, Product.name, Product.price, Product.quantity)
+            .where(Product.quantity < _threshold(threshold))
+            .execution_options(yield_per=chunk_size)
+        )
+        async with self.db.session() as session:
+            result = await session.stream(stmt)
+            async for partition in result.partitions(chunk_size):
+                yield partition
+
+    async def ensure_low_stock_index(self, threshold: int) -> None:
+        """
+        Создать частичный индекс для порога, которого нет в LOW_STOCK_THRESHOLDS.
+
+        Создание индекса блокирует запись в таблицу на время построения.
+
+        Args:
+            threshold (int): порог остатка.
+        """
+        name = f"ix_products_low_stock_{int(threshold)}"
+        index = next((index for index in Product.__table__.indexes if index.name == name), None)
+        if index is None:
+            # Индекс привязывается к копии таблицы: общие метаданные Product не меняются,
+            # и следующий create_all не подхватит индекс для случайного порога
+            table = Product.__table__.to_metadata(MetaData())
+            index = low_stock_index(threshold, table.c.quantity)
+        async with self.db.session() as session:
+            await session.run_sync(lambda sync_session: index.create(sync_session.connection(), checkfirst=True))
+
     async def update_price_by_name(self, name: str, new_price: Decimal) -> None:
         """
         Обновить цену продукта по имени.
@@ -101,10 +224,67 @@ class ProductRepository:
             update(Product)
             .where(Product.name == name)
             .values(price=new_price)
+            .returning(Product.id)
         )
         async with self.db.session() as session:
-            await session.execute(stmt)
-            await session.commit()
+            result = await session.execute(stmt)
+            prod_ids = result.scalars().all()
+        self._invalidate(prod_ids, [name])
+
+    async def update_prices_by_name(self, prices: Mapping[str, Decimal]) -> BulkUpdateResultDTO:
+        """
+        Массово обновить цены продуктов по имени за один запрос.
+
+        Args:
+            prices (Mapping[str, Decimal]): Соответствие имя продукта -> новая цена.
+
+        Returns:
+            BulkUpdateResultDTO: Количество обновлённых продуктов и имена, которых нет в таблице.
+        """
+        values = {name: Decimal(price) for name, price in prices.items()}
+        return await self._bulk_update_by_name("price", "numeric", values)
+
+    async def update_quantities_by_name(self, quantities: Mapping[str, int]) -> BulkUpdateResultDTO:
+        """
+        Массово обновить остатки продуктов по имени за один запрос.
+
+        Args:
+            quantities (Mapping[str, int]): Соответствие имя продукта -> новое количество.
+
+        Returns:
+            BulkUpdateResultDTO: Количество обновлённых продуктов и имена, которых нет в таблице.
+        """
+        return await self._bulk_update_by_name("quantity", "integer", dict(quantities))
+
+    async def _bulk_update_by_name(self, column: str, sql_type: str,
+                                   values: Mapping[str, object]) -> BulkUpdateResultDTO:
+        """
+        Обновляет одну колонку у множества продуктов запросом UPDATE ... FROM unnest (bulk_update_statement).
+
+        Имена и значения передаются двумя массивами, поэтому текст запроса не зависит
+        от размера пачки, а вся пачка применяется за один round-trip и одну транзакцию.
+
+        Args:
+            column (str): Обновляемая колонка (price или quantity).
+            sql_type (str): SQL-тип значений колонки для приведения массива.
+            values (Mapping[str, object]): Соответствие имя продукта -> новое значение.
+
+        Returns:
+            BulkUpdateResultDTO: Количество обновлённых продуктов и имена, которых нет в таблице.
+        """
+        if not values:
+            return BulkUpdateResultDTO(matched=0, unknown_names=[])
+        stmt = bulk_update_statement(Product.__tablename__, ("name", "text"), ((column, sql_type),), ("id", "name"))
+        async with self.db.session() as session:
+            result = await session.execute(stmt, {"name": list(values.keys()), column: list(values.values())})
+            rows = result.all()
+
+        matched = {row.name for row in rows}
+        self._invalidate([row.id for row in rows], matched)
+        return BulkUpdateResultDTO(
+            matched=len(rows),
+            unknown_names=[name for name in values if name not in matched],
+        )
 
     async def delete_product(self, prod_id: int) -> None:
         """
@@ -113,9 +293,19 @@ class ProductRepository:
         Args:
             prod_id (int): Идентификатор продукта.
         """
+        stmt = delete(Product).where(Product.id == prod_id).returning(Product.name)
         async with self.db.session() as session:
-            await session.execute(delete(Product).where(Product.id == prod_id))
-            await session.commit()
+            result = await session.execute(stmt)
+            names = result.scalars().all()
+        self._invalidate([prod_id], names)
 
-    def __repr__(self):
-        return f"<ProductRepository(db={self.db!r})>"
+    def _invalidate(self, prod_ids: Iterable[int] = (), names: Iterable[str] = ()) -> None:
+        """
+        Сбрасывает в кеше продукты с указанными ID и именами.
+
+        Args:
+            prod_ids (Iterable[int]): Идентификаторы продуктов.
+            names (Iterable[str]): Имена продуктов.
+        """
+        self._forget(*(("product_id", prod_id) for prod_id in prod_ids))
+        self._forget(*(("product_name", name) for name in names))
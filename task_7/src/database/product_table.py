@@ -1,13 +1,35 @@
 from decimal import Decimal
-from sqlalchemy import Integer, String, Numeric
+from typing import Union
+
+from sqlalchemy import Column, Index, Integer, String, Numeric, text
 from sqlalchemy.orm import mapped_column, Mapped
 
-from src.database.connector import Base
+from src.database.base_table import Base
+
+# Пороги остатка, для которых поддерживаются частичные индексы ix_products_low_stock_<порог>
+LOW_STOCK_THRESHOLDS = (10,)
+
+
+def low_stock_index(threshold: int, quantity: Union[str, Column] = "quantity") -> Index:
+    """
+    Частичный покрывающий индекс для запроса «остаток меньше threshold».
+
+    Индекс содержит только подходящие строки и все выбираемые колонки,
+    поэтому запрос выполняется index-only сканом по небольшому индексу.
+    Если передана колонка таблицы, индекс сразу привязывается к ней.
+    """
+    threshold = int(threshold)
+    return Index(
+        f"ix_products_low_stock_{threshold}", quantity,
+        postgresql_where=text(f"quantity < {threshold}"),
+        postgresql_include=["id", "name", "price"],
+    )
 
 
 class Product(Base):
     """Модель продукта."""
     __tablename__ = "products"
+    __table_args__ = tuple(low_stock_index(threshold) for threshold in LOW_STOCK_THRESHOLDS)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)